@@ -28,9 +28,20 @@
 Abstract Base class representing operations on a property graph of resources.
 Could be a delegation, a broker view of resources or a slice.
 """
+import functools
 import json
 import uuid
+from collections import defaultdict
+
 import networkx as nx
+
+# orjson is a much faster C parser; used where we only validate JSON blobs.
+# Its JSONDecodeError subclasses the stdlib one so except clauses are unaffected.
+try:
+    import orjson
+    _fast_json_loads = orjson.loads
+except ImportError:
+    _fast_json_loads = json.loads
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Set, Tuple
 from enum import Enum
@@ -54,6 +65,285 @@ from fim.slivers.gateway import Gateway
 from fim.slivers.maintenance_mode import MaintenanceInfo
 from fim.graph.graph_util import GraphML
 
+# Module-level aliases for the property-name constants used on the hot
+# sliver deserialization path below. Binding them once turns a class-attribute
+# descent per dict access into a plain global load, which adds up when
+# building thousands of slivers from a large graph.
+_NODE_ID = ABCPropertyGraphConstants.NODE_ID
+_PROP_NAME = ABCPropertyGraphConstants.PROP_NAME
+_PROP_TYPE = ABCPropertyGraphConstants.PROP_TYPE
+_PROP_MODEL = ABCPropertyGraphConstants.PROP_MODEL
+_PROP_CAPACITIES = ABCPropertyGraphConstants.PROP_CAPACITIES
+_PROP_CAPACITY_HINTS = ABCPropertyGraphConstants.PROP_CAPACITY_HINTS
+_PROP_LABELS = ABCPropertyGraphConstants.PROP_LABELS
+_PROP_CAPACITY_DELEGATIONS = ABCPropertyGraphConstants.PROP_CAPACITY_DELEGATIONS
+_PROP_LABEL_DELEGATIONS = ABCPropertyGraphConstants.PROP_LABEL_DELEGATIONS
+_PROP_CAPACITY_ALLOCATIONS = ABCPropertyGraphConstants.PROP_CAPACITY_ALLOCATIONS
+_PROP_LABEL_ALLOCATIONS = ABCPropertyGraphConstants.PROP_LABEL_ALLOCATIONS
+_PROP_STRUCTURAL_INFO = ABCPropertyGraphConstants.PROP_STRUCTURAL_INFO
+_PROP_RESERVATION_INFO = ABCPropertyGraphConstants.PROP_RESERVATION_INFO
+_PROP_DETAILS = ABCPropertyGraphConstants.PROP_DETAILS
+_PROP_NODE_MAP = ABCPropertyGraphConstants.PROP_NODE_MAP
+_PROP_STITCH_NODE = ABCPropertyGraphConstants.PROP_STITCH_NODE
+_PROP_TAGS = ABCPropertyGraphConstants.PROP_TAGS
+_PROP_FLAGS = ABCPropertyGraphConstants.PROP_FLAGS
+_PROP_MEAS_DATA = ABCPropertyGraphConstants.PROP_MEAS_DATA
+_PROP_USER_DATA = ABCPropertyGraphConstants.PROP_USER_DATA
+_PROP_LAYOUT_DATA = ABCPropertyGraphConstants.PROP_LAYOUT_DATA
+_PROP_BOOT_SCRIPT = ABCPropertyGraphConstants.PROP_BOOT_SCRIPT
+_PROP_IMAGE_REF = ABCPropertyGraphConstants.PROP_IMAGE_REF
+_PROP_IMAGE_TYPE = ABCPropertyGraphConstants.PROP_IMAGE_TYPE
+_PROP_MGMT_IP = ABCPropertyGraphConstants.PROP_MGMT_IP
+_PROP_ALLOCATION_CONSTRAINTS = ABCPropertyGraphConstants.PROP_ALLOCATION_CONSTRAINTS
+_PROP_SERVICE_ENDPOINT = ABCPropertyGraphConstants.PROP_SERVICE_ENDPOINT
+_PROP_SITE = ABCPropertyGraphConstants.PROP_SITE
+_PROP_LOCATION = ABCPropertyGraphConstants.PROP_LOCATION
+_PROP_MAINTENANCE_INFO = ABCPropertyGraphConstants.PROP_MAINTENANCE_INFO
+_PROP_LAYER = ABCPropertyGraphConstants.PROP_LAYER
+_PROP_TECHNOLOGY = ABCPropertyGraphConstants.PROP_TECHNOLOGY
+_PROP_ERO = ABCPropertyGraphConstants.PROP_ERO
+_PROP_PATH_INFO = ABCPropertyGraphConstants.PROP_PATH_INFO
+_PROP_CONTROLLER_URL = ABCPropertyGraphConstants.PROP_CONTROLLER_URL
+_PROP_GATEWAY = ABCPropertyGraphConstants.PROP_GATEWAY
+_PROP_MIRROR_PORT = ABCPropertyGraphConstants.PROP_MIRROR_PORT
+_PROP_MIRROR_DIRECTION = ABCPropertyGraphConstants.PROP_MIRROR_DIRECTION
+_PROP_PEER_LABELS = ABCPropertyGraphConstants.PROP_PEER_LABELS
+
+# Expected-label sets for multi-class guards. Hoisting them lets the hot
+# helpers do one C-level isdisjoint() against a prebuilt frozenset instead
+# of rebuilding a small set or chaining 'not in' tests on every call.
+_NODE_OR_COMPOSITE_LABELS = frozenset({ABCPropertyGraphConstants.CLASS_NetworkNode,
+                                       ABCPropertyGraphConstants.CLASS_CompositeNode})
+_NODE_COMPONENT_OR_COMPOSITE_LABELS = frozenset({ABCPropertyGraphConstants.CLASS_NetworkNode,
+                                                 ABCPropertyGraphConstants.CLASS_Component,
+                                                 ABCPropertyGraphConstants.CLASS_CompositeNode})
+_LINK_OR_NS_LABELS = frozenset({ABCPropertyGraphConstants.CLASS_Link,
+                                ABCPropertyGraphConstants.CLASS_NetworkService})
+
+# relationships the deep sliver builders traverse
+_DEEP_SLIVER_RELS = [ABCPropertyGraphConstants.REL_HAS,
+                     ABCPropertyGraphConstants.REL_CONNECTS]
+
+# Deep-sliver build spec: class label -> (sliver factory method name, child
+# descriptors). Each descriptor gives the relationship and class label of the
+# children, the info container collecting their slivers, the container's add
+# method and the sliver attribute the container lands on. A single spec-driven
+# walker (_sliver_from_subtree) replaces per-class recursive builders.
+# Filled in below - the factories are static methods on ABCPropertyGraph.
+_SUBTREE_BUILD_SPEC = {
+    ABCPropertyGraphConstants.CLASS_NetworkNode:
+        ('node_sliver_from_graph_properties_dict',
+         ((ABCPropertyGraphConstants.REL_HAS, ABCPropertyGraphConstants.CLASS_Component,
+           AttachedComponentsInfo, 'add_device', 'attached_components_info'),
+          (ABCPropertyGraphConstants.REL_HAS, ABCPropertyGraphConstants.CLASS_NetworkService,
+           NetworkServiceInfo, 'add_network_service', 'network_service_info'))),
+    ABCPropertyGraphConstants.CLASS_Component:
+        ('component_sliver_from_graph_properties_dict',
+         ((ABCPropertyGraphConstants.REL_HAS, ABCPropertyGraphConstants.CLASS_NetworkService,
+           NetworkServiceInfo, 'add_network_service', 'network_service_info'),)),
+    ABCPropertyGraphConstants.CLASS_NetworkService:
+        ('network_service_sliver_from_graph_properties_dict',
+         ((ABCPropertyGraphConstants.REL_CONNECTS, ABCPropertyGraphConstants.CLASS_ConnectionPoint,
+           InterfaceInfo, 'add_interface', 'interface_info'),)),
+    ABCPropertyGraphConstants.CLASS_ConnectionPoint:
+        ('interface_sliver_from_graph_properties_dict', ()),
+}
+# composite nodes are walked exactly like network nodes
+_SUBTREE_BUILD_SPEC[ABCPropertyGraphConstants.CLASS_CompositeNode] = \
+    _SUBTREE_BUILD_SPEC[ABCPropertyGraphConstants.CLASS_NetworkNode]
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_capacities(json_string: str) -> Capacities:
+    return Capacities.from_json(json_string)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_labels(json_string: str) -> Labels:
+    return Labels.from_json(json_string)
+
+
+def _parse_capacities(json_string: str) -> Capacities or None:
+    """
+    Cached Capacities parse keyed on the raw JSON string - identical capacity
+    strings recur across many slivers of a large graph (e.g. every port of the
+    same NIC model). Returns a fresh copy each time since instances are mutable.
+    """
+    if not json_string:
+        return None
+    proto = _cached_capacities(json_string)
+    if proto is None:
+        return None
+    return Capacities.update(proto)
+
+
+def _parse_labels(json_string: str) -> Labels or None:
+    """
+    Cached Labels parse keyed on the raw JSON string (see _parse_capacities).
+    """
+    if not json_string:
+        return None
+    proto = _cached_labels(json_string)
+    if proto is None:
+        return None
+    return Labels.update(proto)
+
+
+def _to_json(v):
+    return v.to_json()
+
+
+def _json_attr(v):
+    # mf_data, user_data and layout_data already carry their JSON form
+    return v.json
+
+
+# (sliver attribute, graph property, transform) tables driving the
+# *_sliver_to_graph_properties_dict methods below. One shared loop replaces
+# a long run of near-identical 'if attr is not None' blocks per method.
+_BASE_SLIVER_FIELDS = (
+    ('resource_name', _PROP_NAME, None),
+    ('resource_type', _PROP_TYPE, str),
+    ('resource_model', _PROP_MODEL, None),
+    ('capacities', _PROP_CAPACITIES, _to_json),
+    ('capacity_hints', _PROP_CAPACITY_HINTS, _to_json),
+    ('labels', _PROP_LABELS, _to_json),
+    ('capacity_delegations', _PROP_CAPACITY_DELEGATIONS, _to_json),
+    ('label_delegations', _PROP_LABEL_DELEGATIONS, _to_json),
+    ('capacity_allocations', _PROP_CAPACITY_ALLOCATIONS, _to_json),
+    ('label_allocations', _PROP_LABEL_ALLOCATIONS, _to_json),
+    ('reservation_info', _PROP_RESERVATION_INFO, _to_json),
+    ('structural_info', _PROP_STRUCTURAL_INFO, _to_json),
+    ('details', _PROP_DETAILS, None),
+    ('node_map', _PROP_NODE_MAP, json.dumps),
+    ('mf_data', _PROP_MEAS_DATA, _json_attr),
+    ('user_data', _PROP_USER_DATA, _json_attr),
+    ('layout_data', _PROP_LAYOUT_DATA, _json_attr),
+    ('tags', _PROP_TAGS, _to_json),
+    ('flags', _PROP_FLAGS, _to_json),
+    ('boot_script', _PROP_BOOT_SCRIPT, None),
+)
+
+_NODE_SLIVER_FIELDS = (
+    ('management_ip', _PROP_MGMT_IP, str),
+    ('allocation_constraints', _PROP_ALLOCATION_CONSTRAINTS, None),
+    ('service_endpoint', _PROP_SERVICE_ENDPOINT, str),
+    ('site', _PROP_SITE, None),
+    ('location', _PROP_LOCATION, _to_json),
+    ('maintenance_info', _PROP_MAINTENANCE_INFO, _to_json),
+)
+
+_LINK_SLIVER_FIELDS = (
+    ('layer', _PROP_LAYER, str),
+    ('technology', _PROP_TECHNOLOGY, str),
+)
+
+_NS_SLIVER_FIELDS = (
+    ('layer', _PROP_LAYER, str),
+    ('technology', _PROP_TECHNOLOGY, str),
+    ('allocation_constraints', _PROP_ALLOCATION_CONSTRAINTS, None),
+    ('ero', _PROP_ERO, _to_json),
+    ('path_info', _PROP_PATH_INFO, _to_json),
+    ('controller_url', _PROP_CONTROLLER_URL, None),
+    ('site', _PROP_SITE, None),
+    ('gateway', _PROP_GATEWAY, _to_json),
+    ('mirror_port', _PROP_MIRROR_PORT, None),
+    ('mirror_direction', _PROP_MIRROR_DIRECTION, str),
+)
+
+_INTERFACE_SLIVER_FIELDS = (
+    ('peer_labels', _PROP_PEER_LABELS, _to_json),
+)
+
+
+def _pack_sliver_fields(sliver, fields, prop_dict: Dict[str, str]) -> None:
+    """
+    Set graph properties from sliver attributes per a field table.
+    getattr with a default covers slivers unpickled from an older
+    version of the code where an attribute may not be present.
+    """
+    for attr, key, tx in fields:
+        v = getattr(sliver, attr, None)
+        if v is not None:
+            prop_dict[key] = tx(v) if tx is not None else v
+
+
+# (set_properties kwarg, graph property, parser) tables driving the
+# *_sliver_from_graph_properties_dict methods below. Properties absent
+# from the node are skipped instead of pushing a dozen Nones through
+# set_properties - fresh slivers already default every field to None.
+_BASE_SLIVER_PARSERS = (
+    ('name', _PROP_NAME, None),
+    ('model', _PROP_MODEL, None),
+    ('capacities', _PROP_CAPACITIES, _parse_capacities),
+    ('capacity_hints', _PROP_CAPACITY_HINTS, CapacityHints.from_json),
+    ('labels', _PROP_LABELS, _parse_labels),
+    ('capacity_delegations', _PROP_CAPACITY_DELEGATIONS,
+     lambda v: Delegations.from_json(atype=DelegationType.CAPACITY, json_str=v)),
+    ('label_delegations', _PROP_LABEL_DELEGATIONS,
+     lambda v: Delegations.from_json(atype=DelegationType.LABEL, json_str=v)),
+    ('capacity_allocations', _PROP_CAPACITY_ALLOCATIONS, _parse_capacities),
+    ('label_allocations', _PROP_LABEL_ALLOCATIONS, _parse_labels),
+    ('structural_info', _PROP_STRUCTURAL_INFO, StructuralInfo.from_json),
+    ('reservation_info', _PROP_RESERVATION_INFO, ReservationInfo.from_json),
+    ('details', _PROP_DETAILS, None),
+    ('node_map', _PROP_NODE_MAP, json.loads),
+    ('stitch_node', _PROP_STITCH_NODE, json.loads),
+    ('tags', _PROP_TAGS, Tags.from_json),
+    ('flags', _PROP_FLAGS, Flags.from_json),
+    ('mf_data', _PROP_MEAS_DATA, MeasurementData),
+    ('user_data', _PROP_USER_DATA, UserData),
+    ('layout_data', _PROP_LAYOUT_DATA, LayoutData),
+    ('boot_script', _PROP_BOOT_SCRIPT, None),
+)
+
+_NODE_SLIVER_PARSERS = (
+    ('management_ip', _PROP_MGMT_IP, None),
+    ('allocation_constraints', _PROP_ALLOCATION_CONSTRAINTS, None),
+    ('service_endpoint', _PROP_SERVICE_ENDPOINT, None),
+    ('site', _PROP_SITE, None),
+    ('location', _PROP_LOCATION, Location.from_json),
+    ('maintenance_info', _PROP_MAINTENANCE_INFO, MaintenanceInfo.from_json),
+)
+
+_LINK_SLIVER_PARSERS = (
+    ('layer', _PROP_LAYER, NSLayer.from_string),
+    ('technology', _PROP_TECHNOLOGY, None),
+)
+
+_NS_SLIVER_PARSERS = (
+    ('layer', _PROP_LAYER, NSLayer.from_string),
+    ('technology', _PROP_TECHNOLOGY, None),
+    ('allocation_constraints', _PROP_ALLOCATION_CONSTRAINTS, None),
+    ('ero', _PROP_ERO, ERO.from_json),
+    ('path_info', _PROP_PATH_INFO, PathInfo.from_json),
+    ('controller_url', _PROP_CONTROLLER_URL, None),
+    ('site', _PROP_SITE, None),
+    ('gateway', _PROP_GATEWAY, Gateway.from_json),
+    ('mirror_port', _PROP_MIRROR_PORT, None),
+    ('mirror_direction', _PROP_MIRROR_DIRECTION, MirrorDirection.from_string),
+)
+
+_INTERFACE_SLIVER_PARSERS = (
+    ('peer_labels', _PROP_PEER_LABELS, _parse_labels),
+)
+
+
+def _unpack_sliver_fields(d: Dict[str, str], fields) -> Dict[str, Any]:
+    """
+    Build a set_properties kwargs dict from graph properties per a field
+    table, including only the properties actually present on the node.
+    """
+    kwargs = dict()
+    for kwarg, key, parse in fields:
+        v = d.get(key, None)
+        if v is not None:
+            if parse is not None:
+                v = parse(v)
+            if v is not None:
+                kwargs[kwarg] = v
+    return kwargs
+
 
 class GraphFormat(Enum):
     # default, works in Neo4j and NetworkX
@@ -84,8 +374,8 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         "label_allocations": ABCPropertyGraphConstants.PROP_LABEL_ALLOCATIONS,
         "reservation_info": ABCPropertyGraphConstants.PROP_RESERVATION_INFO,
         "site": ABCPropertyGraphConstants.PROP_SITE,
-        # note lack of image type in this mapping
         "image_ref": ABCPropertyGraphConstants.PROP_IMAGE_REF,
+        "image_type": ABCPropertyGraphConstants.PROP_IMAGE_TYPE,
         "management_ip": ABCPropertyGraphConstants.PROP_MGMT_IP,
         "allocation_constraints": ABCPropertyGraphConstants.PROP_ALLOCATION_CONSTRAINTS,
         "service_endpoint": ABCPropertyGraphConstants.PROP_SERVICE_ENDPOINT,
@@ -345,6 +635,60 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
 
+    @abstractmethod
+    def get_subtree_properties(self, *, node_id: str, rels: List[str], max_depth: int) -> \
+            Tuple[Dict[str, Tuple[List[str], Dict[str, Any]]], Dict[str, List[Tuple[str, str]]]]:
+        """
+        Return labels, properties and adjacency of all nodes reachable from
+        this node over the specified relationships within max_depth hops,
+        including the node itself. Returns a (nodes, adjacency) pair where
+        nodes maps node id to its (labels, properties) and adjacency maps
+        node id to (relationship, neighbor id) pairs within the subtree
+        (both directions of every edge). Backends fetch the subtree in as
+        few queries as they can.
+        :param node_id:
+        :param rels: relationship types to traverse
+        :param max_depth:
+        :return:
+        """
+
+    def get_first_neighbor_checked(self, *, node_id: str, parent_labels: Set[str],
+                                   rel: str, node_label: str) -> List:
+        """
+        Same as get_first_neighbor, but also verifies that the parent node carries
+        at least one of the expected labels, raising PropertyGraphQueryException
+        otherwise. Backends may fuse the label check and the traversal into a
+        single query.
+        :param node_id:
+        :param parent_labels: acceptable labels/classes of the parent node
+        :param rel:
+        :param node_label:
+        :return:
+        """
+        labels, _ = self.get_node_properties(node_id=node_id)
+        if parent_labels.isdisjoint(labels):
+            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
+                                              msg=f"Node type is not {' or '.join(sorted(parent_labels))}")
+        return self.get_first_neighbor(node_id=node_id, rel=rel, node_label=node_label)
+
+    def get_first_neighbor_by_name(self, *, node_id: str, rel: str, node_label: str, name: str) -> List:
+        """
+        Return a list of ids of nodes of this label with this Name property related via
+        relationship. List may be empty. Default implementation scans the neighbor list;
+        backends may override to push the name predicate into a single query.
+        :param node_id:
+        :param rel:
+        :param node_label:
+        :param name:
+        :return:
+        """
+        ret = list()
+        for n in self.get_first_neighbor(node_id=node_id, rel=rel, node_label=node_label):
+            _, props = self.get_node_properties(node_id=n)
+            if props.get(_PROP_NAME, None) == name:
+                ret.append(n)
+        return ret
+
     @abstractmethod
     def get_first_and_second_neighbor(self, *, node_id: str, rel1: str, node1_label: str,
                                       rel2: str, node2_label: str) -> List:
@@ -359,6 +703,30 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
 
+    def get_second_neighbors(self, *, node_id: str, rel1: str, node1_label: str,
+                             rel2: str, node2_label: str) -> List:
+        """
+        Return a list of ids of the second neighbors only (distinct), when the
+        intermediate first neighbor is not of interest. Default implementation
+        projects from get_first_and_second_neighbor; backends may override so
+        only the second-neighbor column crosses the driver boundary.
+        :param node_id:
+        :param rel1:
+        :param node1_label:
+        :param rel2:
+        :param node2_label:
+        :return:
+        """
+        seen = set()
+        ret = list()
+        for tup in self.get_first_and_second_neighbor(node_id=node_id, rel1=rel1,
+                                                      node1_label=node1_label, rel2=rel2,
+                                                      node2_label=node2_label):
+            if tup[1] not in seen:
+                seen.add(tup[1])
+                ret.append(tup[1])
+        return ret
+
     @abstractmethod
     def node_exists(self, *, node_id: str, label: str):
         """
@@ -390,6 +758,24 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
 
+    def bulk_add(self, *, nodes_by_label: Dict, edges_by_rel: Dict) -> None:
+        """
+        Add a batch of nodes and edges to the graph, already partitioned the way
+        bulk writes want them: label -> list of (node_id, properties dict) and
+        relationship -> list of (node_a, node_b). Default implementation adds
+        one element at a time; backends may override with one bulk operation
+        per partition.
+        :param nodes_by_label:
+        :param edges_by_rel:
+        :return:
+        """
+        for label, node_rows in nodes_by_label.items():
+            for node_id, props in node_rows:
+                self.add_node(node_id=node_id, label=label, props=props)
+        for rel, edge_rows in edges_by_rel.items():
+            for node_a, node_b in edge_rows:
+                self.add_link(node_a=node_a, rel=rel, node_b=node_b)
+
     @abstractmethod
     def delete_node(self, *, node_id: str):
         """
@@ -398,6 +784,17 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
 
+    def delete_nodes(self, *, node_ids) -> None:
+        """
+        Delete multiple nodes from a graph (incident edges automatically deleted).
+        Default implementation deletes one node at a time; backends may override
+        with a single bulk operation.
+        :param node_ids: iterable of node ids
+        :return:
+        """
+        for node_id in node_ids:
+            self.delete_node(node_id=node_id)
+
     @abstractmethod
     def find_matching_nodes(self, *, other_graph) -> Set:
         """
@@ -442,7 +839,7 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
             # try loading it as JSON. Exception may be thrown
             if props[prop_name] is not None and len(props[prop_name]) > 0 and props[prop_name] != "None":
                 try:
-                    json.loads(props[prop_name])
+                    _fast_json_loads(props[prop_name])
                 except json.decoder.JSONDecodeError:
                     return prop_name, props[prop_name]
             else:
@@ -484,56 +881,10 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         """
         prop_dict = dict()
 
-        # hasattr checks are added because slivers sometimes are unpickled and certain
-        # attributes may not be present (come from an older version of the code)
-        if hasattr(sliver, 'resource_name') and sliver.resource_name is not None:
-            prop_dict[ABCPropertyGraph.PROP_NAME] = sliver.resource_name
-        if hasattr(sliver, 'resource_type') and sliver.resource_type is not None:
-            prop_dict[ABCPropertyGraph.PROP_TYPE] = str(sliver.resource_type)
-        if hasattr(sliver, 'resource_model') and sliver.resource_model is not None:
-            prop_dict[ABCPropertyGraph.PROP_MODEL] = sliver.resource_model
-        if hasattr(sliver, 'capacities') and sliver.capacities is not None:
-            prop_dict[ABCPropertyGraph.PROP_CAPACITIES] = sliver.capacities.to_json()
-        if hasattr(sliver, 'capacity_hints') and sliver.capacity_hints is not None:
-            prop_dict[ABCPropertyGraph.PROP_CAPACITY_HINTS] = sliver.capacity_hints.to_json()
-        if hasattr(sliver, 'labels') and sliver.labels is not None:
-            prop_dict[ABCPropertyGraph.PROP_LABELS] = sliver.labels.to_json()
-        if hasattr(sliver, 'capacity_delegations') and sliver.capacity_delegations is not None:
-            prop_dict[ABCPropertyGraph.PROP_CAPACITY_DELEGATIONS] = \
-                sliver.capacity_delegations.to_json()
-        if hasattr(sliver, 'label_delegations') and sliver.label_delegations is not None:
-            prop_dict[ABCPropertyGraph.PROP_LABEL_DELEGATIONS] = \
-                sliver.label_delegations.to_json()
-        if hasattr(sliver, 'capacity_allocations') and sliver.capacity_allocations is not None:
-            prop_dict[ABCPropertyGraph.PROP_CAPACITY_ALLOCATIONS] = sliver.capacity_allocations.to_json()
-        if hasattr(sliver, 'label_allocations') and sliver.label_allocations is not None:
-            prop_dict[ABCPropertyGraph.PROP_LABEL_ALLOCATIONS] = sliver.label_allocations.to_json()
-        if hasattr(sliver, 'reservation_info') and sliver.reservation_info is not None:
-            prop_dict[ABCPropertyGraph.PROP_RESERVATION_INFO] = sliver.reservation_info.to_json()
-        if hasattr(sliver, 'structural_info') and sliver.structural_info is not None:
-            prop_dict[ABCPropertyGraph.PROP_STRUCTURAL_INFO] = sliver.structural_info.to_json()
-        if hasattr(sliver, 'details') and sliver.details is not None:
-            prop_dict[ABCPropertyGraph.PROP_DETAILS] = sliver.details
-        if hasattr(sliver, 'node_map') and sliver.node_map is not None:
-            prop_dict[ABCPropertyGraph.PROP_NODE_MAP] = json.dumps(sliver.node_map)
+        _pack_sliver_fields(sliver, _BASE_SLIVER_FIELDS, prop_dict)
         if hasattr(sliver, 'stitch_node'):
             # boolean is always there. use json dumps for simplicity
-            prop_dict[ABCPropertyGraph.PROP_STITCH_NODE] = json.dumps(sliver.stitch_node)
-        # this is already a JSON dict
-        if hasattr(sliver, 'mf_data') and sliver.mf_data is not None:
-            prop_dict[ABCPropertyGraph.PROP_MEAS_DATA] = sliver.mf_data.json
-        # this is already a JSON dict
-        if hasattr(sliver, 'user_data') and sliver.user_data is not None:
-            prop_dict[ABCPropertyGraph.PROP_USER_DATA] = sliver.user_data.json
-        # this is already a JSON dict
-        if hasattr(sliver, 'layout_data') and sliver.layout_data is not None:
-            prop_dict[ABCPropertyGraph.PROP_LAYOUT_DATA] = sliver.layout_data.json
-        if hasattr(sliver, 'tags') and sliver.tags is not None:
-            prop_dict[ABCPropertyGraph.PROP_TAGS] = sliver.tags.to_json()
-        if hasattr(sliver, 'flags') and sliver.flags is not None:
-            prop_dict[ABCPropertyGraph.PROP_FLAGS] = sliver.flags.to_json()
-        if hasattr(sliver, 'boot_script') and sliver.boot_script is not None:
-            prop_dict[ABCPropertyGraph.PROP_BOOT_SCRIPT] = sliver.boot_script
+            prop_dict[_PROP_STITCH_NODE] = json.dumps(sliver.stitch_node)
 
         return prop_dict
 
@@ -546,23 +897,13 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         """
         prop_dict = ABCPropertyGraph.base_sliver_to_graph_properties_dict(sliver)
 
-        # hasattr checks are added because slivers sometimes are unpickled and certain
-        # attributes may not be present (come from an older version of the code)
-        if hasattr(sliver, 'image_ref') and hasattr(sliver, 'image_type') and \
-                sliver.image_ref is not None and sliver.image_type is not None:
-            prop_dict[ABCPropertyGraph.PROP_IMAGE_REF] = sliver.image_ref + ',' + str(sliver.image_type)
-        if hasattr(sliver, 'management_ip') and sliver.management_ip is not None:
-            prop_dict[ABCPropertyGraph.PROP_MGMT_IP] = str(sliver.management_ip)
-        if hasattr(sliver, 'allocation_constraints') and sliver.allocation_constraints is not None:
-            prop_dict[ABCPropertyGraph.PROP_ALLOCATION_CONSTRAINTS] = sliver.allocation_constraints
-        if hasattr(sliver, 'service_endpoint') and sliver.service_endpoint is not None:
-            prop_dict[ABCPropertyGraph.PROP_SERVICE_ENDPOINT] = str(sliver.service_endpoint)
-        if hasattr(sliver, 'site') and sliver.site is not None:
-            prop_dict[ABCPropertyGraph.PROP_SITE] = sliver.site
-        if hasattr(sliver, 'location') and sliver.location is not None:
-            prop_dict[ABCPropertyGraph.PROP_LOCATION] = sliver.location.to_json()
-        if hasattr(sliver, 'maintenance_info') and sliver.maintenance_info is not None:
-            prop_dict[ABCPropertyGraph.PROP_MAINTENANCE_INFO] = sliver.maintenance_info.to_json()
+        # image_ref and image_type are stored as separate properties
+        # (older graphs packed them as 'ref,type' into ImageRef)
+        if getattr(sliver, 'image_ref', None) is not None and \
+                getattr(sliver, 'image_type', None) is not None:
+            prop_dict[_PROP_IMAGE_REF] = sliver.image_ref
+            prop_dict[_PROP_IMAGE_TYPE] = str(sliver.image_type)
+        _pack_sliver_fields(sliver, _NODE_SLIVER_FIELDS, prop_dict)
 
         return prop_dict
 
@@ -575,12 +916,7 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         """
         prop_dict = ABCPropertyGraph.base_sliver_to_graph_properties_dict(sliver)
 
-        # hasattr checks are added because slivers sometimes are unpickled and certain
-        # attributes may not be present (come from an older version of the code)
-        if hasattr(sliver, 'layer') and sliver.layer is not None:
-            prop_dict[ABCPropertyGraph.PROP_LAYER] = str(sliver.layer)
-        if hasattr(sliver, 'technology') and sliver.technology is not None:
-            prop_dict[ABCPropertyGraph.PROP_TECHNOLOGY] = str(sliver.technology)
+        _pack_sliver_fields(sliver, _LINK_SLIVER_FIELDS, prop_dict)
 
         return prop_dict
 
@@ -604,28 +940,7 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         """
         prop_dict = ABCPropertyGraph.base_sliver_to_graph_properties_dict(sliver)
 
-        # hasattr checks are added because slivers sometimes are unpickled and certain
-        # attributes may not be present (come from an older version of the code)
-        if hasattr(sliver, 'layer') and sliver.layer is not None:
-            prop_dict[ABCPropertyGraph.PROP_LAYER] = str(sliver.layer)
-        if hasattr(sliver, 'technology') and sliver.technology is not None:
-            prop_dict[ABCPropertyGraph.PROP_TECHNOLOGY] = str(sliver.technology)
-        if hasattr(sliver, 'allocation_constraints') and sliver.allocation_constraints is not None:
-            prop_dict[ABCPropertyGraph.PROP_ALLOCATION_CONSTRAINTS] = sliver.allocation_constraints
-        if hasattr(sliver, 'ero') and sliver.ero is not None:
-            prop_dict[ABCPropertyGraph.PROP_ERO] = sliver.ero.to_json()
-        if hasattr(sliver, 'path_info') and sliver.path_info is not None:
-            prop_dict[ABCPropertyGraph.PROP_PATH_INFO] = sliver.path_info.to_json()
-        if hasattr(sliver, 'controller_url') and sliver.controller_url is not None:
-            prop_dict[ABCPropertyGraph.PROP_CONTROLLER_URL] = sliver.controller_url
-        if hasattr(sliver, 'site') and sliver.site is not None:
-            prop_dict[ABCPropertyGraph.PROP_SITE] = sliver.site
-        if hasattr(sliver, 'gateway') and sliver.gateway is not None:
-            prop_dict[ABCPropertyGraph.PROP_GATEWAY] = sliver.gateway.to_json()
-        if hasattr(sliver, 'mirror_port') and sliver.mirror_port is not None:
-            prop_dict[ABCPropertyGraph.PROP_MIRROR_PORT] = sliver.mirror_port
-        if hasattr(sliver, 'mirror_direction') and sliver.mirror_direction is not None:
-            prop_dict[ABCPropertyGraph.PROP_MIRROR_DIRECTION] = str(sliver.mirror_direction)
+        _pack_sliver_fields(sliver, _NS_SLIVER_FIELDS, prop_dict)
 
         return prop_dict
 
@@ -638,8 +953,7 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         """
         prop_dict = ABCPropertyGraph.base_sliver_to_graph_properties_dict(sliver)
 
-        if hasattr(sliver, 'peer_labels') and sliver.peer_labels is not None:
-            prop_dict[ABCPropertyGraph.PROP_PEER_LABELS] = sliver.peer_labels.to_json()
+        _pack_sliver_fields(sliver, _INTERFACE_SLIVER_FIELDS, prop_dict)
 
         return prop_dict
 
@@ -708,77 +1022,45 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
         # there is no setter for node id so users can't accidentally override it
-        sliver.node_id = d.get(ABCPropertyGraph.NODE_ID, None)
-        sliver.set_properties(name=d.get(ABCPropertyGraph.PROP_NAME, None),
-                              type=sliver.type_from_str(d.get(ABCPropertyGraph.PROP_TYPE, None)),
-                              model=d.get(ABCPropertyGraphConstants.PROP_MODEL, None),
-                              capacities=Capacities.from_json(d.get(ABCPropertyGraph.PROP_CAPACITIES, None)),
-                              capacity_hints=CapacityHints.from_json(d.get(ABCPropertyGraph.PROP_CAPACITY_HINTS, None)),
-                              labels=Labels.from_json(d.get(ABCPropertyGraph.PROP_LABELS, None)),
-                              capacity_delegations=Delegations.from_json(atype=DelegationType.CAPACITY,
-                                                                         json_str=d.get(
-                                                                             ABCPropertyGraph.PROP_CAPACITY_DELEGATIONS,
-                                                                             None)),
-                              label_delegations=Delegations.from_json(atype=DelegationType.LABEL,
-                                                                      json_str=d.get(
-                                                                          ABCPropertyGraph.PROP_LABEL_DELEGATIONS,
-                                                                          None)),
-                              capacity_allocations=Capacities.from_json(
-                                  d.get(ABCPropertyGraph.PROP_CAPACITY_ALLOCATIONS,
-                                        None)),
-                              label_allocations=Labels.from_json(d.get(ABCPropertyGraph.PROP_LABEL_ALLOCATIONS,
-                                                                       None)),
-                              structural_info=StructuralInfo.from_json(
-                                  d.get(ABCPropertyGraph.PROP_STRUCTURAL_INFO, None)),
-                              reservation_info=ReservationInfo.from_json(d.get(ABCPropertyGraph.PROP_RESERVATION_INFO,
-                                                                               None)),
-                              details=d.get(ABCPropertyGraph.PROP_DETAILS, None),
-                              node_map=json.loads(d[ABCPropertyGraph.PROP_NODE_MAP]) if
-                              d.get(ABCPropertyGraph.PROP_NODE_MAP, None) is not None else None,
-                              stitch_node=json.loads(d[ABCPropertyGraph.PROP_STITCH_NODE]) if
-                              d.get(ABCPropertyGraph.PROP_STITCH_NODE, None) is not None else False,
-                              tags=Tags.from_json(d.get(ABCPropertyGraph.PROP_TAGS, None)),
-                              flags=Flags.from_json(d.get(ABCPropertyGraph.PROP_FLAGS, None)),
-                              mf_data=MeasurementData(d[ABCPropertyGraph.PROP_MEAS_DATA])
-                              if d.get(ABCPropertyGraph.PROP_MEAS_DATA, None)
-                                 is not None else None,
-                              user_data=UserData(d[ABCPropertyGraph.PROP_USER_DATA])
-                              if d.get(ABCPropertyGraph.PROP_USER_DATA, None)
-                                 is not None else None,
-                              layout_data=LayoutData(d[ABCPropertyGraph.PROP_LAYOUT_DATA])
-                              if d.get(ABCPropertyGraph.PROP_LAYOUT_DATA, None)
-                                 is not None else None,
-                              boot_script=d.get(ABCPropertyGraph.PROP_BOOT_SCRIPT, None)
-                              )
+        sliver.node_id = d.get(_NODE_ID, None)
+        if not d:
+            return
+        kwargs = _unpack_sliver_fields(d, _BASE_SLIVER_PARSERS)
+        ntype = d.get(_PROP_TYPE, None)
+        if ntype is not None:
+            kwargs['type'] = sliver.type_from_str(ntype)
+        if kwargs:
+            sliver.set_properties(**kwargs)
 
     @staticmethod
     def node_sliver_from_graph_properties_dict(d: Dict[str, str]) -> NodeSliver:
         n = NodeSliver()
-        if d.get(ABCPropertyGraph.PROP_IMAGE_REF, None) is None:
-            image_ref = None
-            image_type = None
-        else:
-            image_ref, image_type = d[ABCPropertyGraph.PROP_IMAGE_REF].split(',')
+        if not d:
+            return n
         ABCPropertyGraph.set_base_sliver_properties_from_graph_properties_dict(n, d)
-        n.set_properties(image_ref=image_ref,
-                         image_type=image_type,
-                         management_ip=d.get(ABCPropertyGraph.PROP_MGMT_IP, None),
-                         allocation_constraints=d.get(ABCPropertyGraph.PROP_ALLOCATION_CONSTRAINTS, None),
-                         service_endpoint=d.get(ABCPropertyGraph.PROP_SERVICE_ENDPOINT, None),
-                         site=d.get(ABCPropertyGraphConstants.PROP_SITE, None),
-                         location=Location.from_json(d.get(ABCPropertyGraph.PROP_LOCATION, None)),
-                         maintenance_info=
-                         MaintenanceInfo.from_json(d.get(ABCPropertyGraph.PROP_MAINTENANCE_INFO, None))
-                         )
+        kwargs = _unpack_sliver_fields(d, _NODE_SLIVER_PARSERS)
+        image_ref = d.get(_PROP_IMAGE_REF, None)
+        image_type = d.get(_PROP_IMAGE_TYPE, None)
+        if image_ref is not None and image_type is None and ',' in image_ref:
+            # legacy graphs packed 'ref,type' into ImageRef
+            image_ref, image_type = image_ref.split(',')
+        if image_ref is not None:
+            kwargs['image_ref'] = image_ref
+        if image_type is not None:
+            kwargs['image_type'] = image_type
+        if kwargs:
+            n.set_properties(**kwargs)
         return n
 
     @staticmethod
     def link_sliver_from_graph_properties_dict(d: Dict[str, str]) -> NetworkLinkSliver:
         n = NetworkLinkSliver()
+        if not d:
+            return n
         ABCPropertyGraph.set_base_sliver_properties_from_graph_properties_dict(n, d)
-        n.set_properties(layer=NSLayer.from_string(d.get(ABCPropertyGraph.PROP_LAYER)),
-                         technology=d.get(ABCPropertyGraph.PROP_TECHNOLOGY),
-                         )
+        kwargs = _unpack_sliver_fields(d, _LINK_SLIVER_PARSERS)
+        if kwargs:
+            n.set_properties(**kwargs)
         return n
 
     @staticmethod
@@ -789,6 +1071,8 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
         cs = ComponentSliver()
+        if not d:
+            return cs
         ABCPropertyGraph.set_base_sliver_properties_from_graph_properties_dict(cs, d)
         return cs
 
@@ -800,19 +1084,12 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
         ns = NetworkServiceSliver()
+        if not d:
+            return ns
         ABCPropertyGraph.set_base_sliver_properties_from_graph_properties_dict(ns, d)
-        ns.set_properties(layer=NSLayer.from_string(d.get(ABCPropertyGraph.PROP_LAYER)),
-                          technology=d.get(ABCPropertyGraph.PROP_TECHNOLOGY),
-                          allocation_constraints=d.get(ABCPropertyGraph.PROP_ALLOCATION_CONSTRAINTS, None),
-                          ero=ERO.from_json(d.get(ABCPropertyGraph.PROP_ERO, None)),
-                          path_info=PathInfo.from_json(d.get(ABCPropertyGraph.PROP_PATH_INFO, None)),
-                          controller_url=d.get(ABCPropertyGraph.PROP_CONTROLLER_URL, None),
-                          site=d.get(ABCPropertyGraphConstants.PROP_SITE, None),
-                          gateway=Gateway.from_json(d.get(ABCPropertyGraphConstants.PROP_GATEWAY, None)),
-                          mirror_port=d.get(ABCPropertyGraphConstants.PROP_MIRROR_PORT, None),
-                          mirror_direction=MirrorDirection.from_string(
-                              d.get(ABCPropertyGraphConstants.PROP_MIRROR_DIRECTION, None))
-                          )
+        kwargs = _unpack_sliver_fields(d, _NS_SLIVER_PARSERS)
+        if kwargs:
+            ns.set_properties(**kwargs)
         return ns
 
     @staticmethod
@@ -823,8 +1100,12 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
         isl = InterfaceSliver()
+        if not d:
+            return isl
         ABCPropertyGraph.set_base_sliver_properties_from_graph_properties_dict(isl, d)
-        isl.set_properties(peer_labels=Labels.from_json(d.get(ABCPropertyGraph.PROP_PEER_LABELS, None)))
+        kwargs = _unpack_sliver_fields(d, _INTERFACE_SLIVER_PARSERS)
+        if kwargs:
+            isl.set_properties(**kwargs)
         return isl
 
     def build_deep_node_sliver(self, *, node_id: str) -> NodeSliver:
@@ -834,33 +1115,52 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :param node_id:
         :return:
         """
-        clazzes, props = self.get_node_properties(node_id=node_id)
-        if ABCPropertyGraph.CLASS_NetworkNode not in clazzes and \
-                ABCPropertyGraph.CLASS_CompositeNode not in clazzes:
+        # one subtree query brings back the node, its components, network
+        # services and their connection points instead of a round-trip per node
+        nodes, adjacency = self.get_subtree_properties(node_id=node_id,
+                                                       rels=_DEEP_SLIVER_RELS, max_depth=3)
+        clazzes, props = nodes[node_id]
+        if _NODE_OR_COMPOSITE_LABELS.isdisjoint(clazzes):
             raise PropertyGraphQueryException(node_id=node_id, graph_id=self.graph_id,
                                               msg="Node is not of class NetworkNode or CompositeNode")
-        # create top-level sliver
-        ns = self.node_sliver_from_graph_properties_dict(props)
-        # find and build deep slivers of network services (if any) and components (if any)
-        comps = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_HAS,
-                                        node_label=ABCPropertyGraph.CLASS_Component)
-        if comps is not None and len(comps) > 0:
-            aci = AttachedComponentsInfo()
-            for c in comps:
-                cs = self.build_deep_component_sliver(node_id=c)
-                aci.add_device(cs)
-            ns.attached_components_info = aci
+        # composite nodes share the NetworkNode build spec
+        return self._sliver_from_subtree(node_id, ABCPropertyGraph.CLASS_NetworkNode, nodes, adjacency)
 
-        nss = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_HAS,
-                                      node_label=ABCPropertyGraph.CLASS_NetworkService)
-        if nss is not None and len(nss) > 0:
-            nsi = NetworkServiceInfo()
-            for s in nss:
-                nssl = self.build_deep_ns_sliver(node_id=s)
-                nsi.add_network_service(nssl)
-            ns.network_service_info = nsi
+    @staticmethod
+    def _subtree_neighbors(node_id: str, rel: str, label: str, nodes: Dict, adjacency: Dict) -> List[str]:
+        """
+        Ids of subtree neighbors of a node related via rel and carrying label,
+        from a get_subtree_properties result
+        :param node_id:
+        :param rel:
+        :param label:
+        :param nodes:
+        :param adjacency:
+        :return:
+        """
+        return [nbr for r, nbr in adjacency.get(node_id, ()) if r == rel and label in nodes[nbr][0]]
 
-        return ns
+    def _sliver_from_subtree(self, node_id: str, clazz: str, nodes: Dict, adjacency: Dict) -> BaseSliver:
+        """
+        Build a deep sliver of the given class from a get_subtree_properties
+        result, recursing into child slivers per _SUBTREE_BUILD_SPEC
+        :param node_id:
+        :param clazz:
+        :param nodes:
+        :param adjacency:
+        :return:
+        """
+        factory, children = _SUBTREE_BUILD_SPEC[clazz]
+        sliver = getattr(self, factory)(nodes[node_id][1])
+        for rel, child_clazz, info_class, add_child, attr in children:
+            child_ids = self._subtree_neighbors(node_id, rel, child_clazz, nodes, adjacency)
+            if len(child_ids) > 0:
+                info = info_class()
+                add = getattr(info, add_child)
+                for c in child_ids:
+                    add(self._sliver_from_subtree(c, child_clazz, nodes, adjacency))
+                setattr(sliver, attr, info)
+        return sliver
 
     @staticmethod
     def build_deep_node_sliver_from_dict(*, props: Dict[str, Any]) -> NodeSliver:
@@ -897,23 +1197,14 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :param node_id:
         :return:
         """
-        clazzes, props = self.get_node_properties(node_id=node_id)
+        # one subtree query brings back the service and its connection points
+        nodes, adjacency = self.get_subtree_properties(node_id=node_id,
+                                                       rels=_DEEP_SLIVER_RELS, max_depth=1)
+        clazzes, props = nodes[node_id]
         if ABCPropertyGraph.CLASS_NetworkService not in clazzes:
             raise PropertyGraphQueryException(node_id=node_id, graph_id=self.graph_id,
                                               msg="Node is not of class NetworkService")
-        # create top-level sliver
-        nss = self.network_service_sliver_from_graph_properties_dict(props)
-        # find interfaces and attach
-        ifs = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_CONNECTS,
-                                      node_label=ABCPropertyGraph.CLASS_ConnectionPoint)
-        if ifs is not None and len(ifs) > 0:
-            ifi = InterfaceInfo()
-            for i in ifs:
-                _, iprops = self.get_node_properties(node_id=i)
-                ifsl = self.interface_sliver_from_graph_properties_dict(iprops)
-                ifi.add_interface(ifsl)
-            nss.interface_info = ifi
-        return nss
+        return self._sliver_from_subtree(node_id, ABCPropertyGraph.CLASS_NetworkService, nodes, adjacency)
 
     @staticmethod
     def build_deep_ns_sliver_from_dict(*, props: Dict[str, Any]) -> NetworkServiceSliver:
@@ -940,22 +1231,15 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :param node_id:
         :return:
         """
-        clazzes, props = self.get_node_properties(node_id=node_id)
+        # one subtree query brings back the component, its network services
+        # and their connection points
+        nodes, adjacency = self.get_subtree_properties(node_id=node_id,
+                                                       rels=_DEEP_SLIVER_RELS, max_depth=2)
+        clazzes, props = nodes[node_id]
         if ABCPropertyGraph.CLASS_Component not in clazzes:
             raise PropertyGraphQueryException(node_id=node_id, graph_id=self.graph_id,
                                               msg="Node is not of class Component")
-        # create top-level sliver
-        cs = self.component_sliver_from_graph_properties_dict(props)
-        # find any network services, build and attach
-        nss = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_HAS,
-                                      node_label=ABCPropertyGraph.CLASS_NetworkService)
-        if nss is not None and len(nss) > 0:
-            nsi = NetworkServiceInfo()
-            for s in nss:
-                nssl = self.build_deep_ns_sliver(node_id=s)
-                nsi.add_network_service(nssl)
-            cs.network_service_info = nsi
-        return cs
+        return self._sliver_from_subtree(node_id, ABCPropertyGraph.CLASS_Component, nodes, adjacency)
 
     @staticmethod
     def build_deep_component_sliver_from_dict(*, props: Dict[str, Any]) -> ComponentSliver:
@@ -1045,72 +1329,58 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         if ABCPropertyGraph.CLASS_NetworkNode not in labels:
             raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
                                               msg="This node type is not NetworkNode")
+        to_delete = {node_id}
         # get a list of components
         components = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_HAS,
                                              node_label=ABCPropertyGraph.CLASS_Component)
         for cid in components:
-            self.remove_component_with_nss_cps_and_links(node_id=cid)
+            to_delete |= self._collect_component_subtree_ids(node_id=cid, already=to_delete)
 
-        # get a list of network services, delete the node
+        # get a list of network services
         network_services = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_HAS,
                                                    node_label=ABCPropertyGraph.CLASS_NetworkService)
-        self.delete_node(node_id=node_id)
         for cid in network_services:
-            self.remove_ns_with_cps_and_links(node_id=cid)
+            to_delete |= self._collect_ns_subtree_ids(node_id=cid, already=to_delete)
+        self.delete_nodes(node_ids=to_delete)
 
-    def remove_component_with_nss_cps_and_links(self, node_id: str):
+    def _collect_component_subtree_ids(self, *, node_id: str, already: Set[str]) -> Set[str]:
         """
-        Remove a component of a network node with all attached elements (network services
-        and interfaces). Parent interfaces and links are removed if they have no other
-        children or connected interfaces.
+        Collect node ids of a component and its network services, connection points
+        and links slated for removal. Pure traversal - performs no deletions.
         :param node_id: component node id
+        :param already: node ids already slated for removal by the caller
         :return:
         """
-        # check we are a component
-        labels, node_props = self.get_node_properties(node_id=node_id)
-        if ABCPropertyGraph.CLASS_Component not in labels:
-            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
-                                              msg="This node type is not Component")
-        # get a list of NetworkServices, delete the node
+        ids = {node_id}
         network_services = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_HAS,
                                                    node_label=ABCPropertyGraph.CLASS_NetworkService)
-        self.delete_node(node_id=node_id)
         for ns in network_services:
-            self.remove_ns_with_cps_and_links(node_id=ns)
-
-    def remove_network_link(self, node_id: str):
-
-        # check we are a link
-        labels, node_props = self.get_node_properties(node_id=node_id)
-        if ABCPropertyGraph.CLASS_Link not in labels:
-            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
-                                              msg="This node type is not Link")
-        # edges to interfaces/connection points will disappear
-        self.delete_node(node_id=node_id)
+            ids |= self._collect_ns_subtree_ids(node_id=ns, already=already | ids)
+        return ids
 
-    def remove_ns_with_cps_and_links(self, node_id: str):
+    def _collect_ns_subtree_ids(self, *, node_id: str, already: Set[str]) -> Set[str]:
         """
-        Remove network service with subtending interfaces and links
-        :param node_id:
+        Collect node ids of a network service and its connection points and links
+        slated for removal. Pure traversal - performs no deletions.
+        :param node_id: network service node id
+        :param already: node ids already slated for removal by the caller
         :return:
         """
-        # check we are a network service
-        labels, node_props = self.get_node_properties(node_id=node_id)
-        if ABCPropertyGraph.CLASS_NetworkService not in labels:
-            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
-                                              msg="This node type is not NetworkService")
-        # get a list of interfaces, delete the network service
+        ids = {node_id}
         interfaces = self.get_first_neighbor(node_id=node_id, rel=ABCPropertyGraph.REL_CONNECTS,
                                              node_label=ABCPropertyGraph.CLASS_ConnectionPoint)
-        self.delete_node(node_id=node_id)
         for iif in interfaces:
-            self.remove_cp_and_links(node_id=iif)
+            ids |= self._collect_cp_and_link_ids(node_id=iif, already=already | ids)
+        return ids
 
-    def remove_cp_and_links(self, node_id: str):
+    def _collect_cp_and_link_ids(self, *, node_id: str, already: Set[str]) -> Set[str]:
         """
-        Remove ConnectionPoint and links. Parent ConnectionPoints and links are removed
-        if they have no other children or other connected connection points.
+        Collect node ids of a ConnectionPoint, of its parent ConnectionPoint if it has
+        no other children, and of connected Links with no other live interfaces. Pure
+        traversal - performs no deletions. already carries node ids slated for removal
+        by the caller so shared parents and links are counted as if they were gone.
         :param node_id: interface node id
+        :param already: node ids already slated for removal by the caller
         :return:
         """
         # some interfaces may have parent interfaces, which can be deleted if they only have the
@@ -1123,7 +1393,7 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
             children = self.get_first_neighbor(node_id=parent,
                                                rel=ABCPropertyGraph.REL_CONNECTS,
                                                node_label=ABCPropertyGraph.CLASS_ConnectionPoint)
-            if len(children) == 1:  # if only child, can delete parent
+            if len([c for c in children if c not in already]) == 1:  # if only child, can delete parent
                 interfaces_to_delete.add(parent)
         # interfaces themselves and parent interfaces
         # may be connected to links which can be deleted if nothing
@@ -1137,11 +1407,112 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
                 connected_interfaces = self.get_first_neighbor(node_id=link,
                                                                rel=ABCPropertyGraph.REL_CONNECTS,
                                                                node_label=ABCPropertyGraph.CLASS_ConnectionPoint)
-                if len(connected_interfaces) == 2:  # connected to us and another thing, can delete
+                # connected to us and another thing, can delete
+                if len([i for i in connected_interfaces if i not in already]) == 2:
                     links_to_delete.add(link)
-        # delete nodes in these sets
-        for deleted_id in interfaces_to_delete.union(links_to_delete):
-            self.delete_node(node_id=deleted_id)
+        # merge in place rather than allocating a third set
+        interfaces_to_delete |= links_to_delete
+        return interfaces_to_delete
+
+    def remove_component_with_nss_cps_and_links(self, node_id: str):
+        """
+        Remove a component of a network node with all attached elements (network services
+        and interfaces). Parent interfaces and links are removed if they have no other
+        children or connected interfaces.
+        :param node_id: component node id
+        :return:
+        """
+        # check we are a component
+        labels, node_props = self.get_node_properties(node_id=node_id)
+        if ABCPropertyGraph.CLASS_Component not in labels:
+            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
+                                              msg="This node type is not Component")
+        self.delete_nodes(node_ids=self._collect_component_subtree_ids(node_id=node_id, already=set()))
+
+    def remove_network_link(self, node_id: str):
+
+        # check we are a link
+        labels, node_props = self.get_node_properties(node_id=node_id)
+        if ABCPropertyGraph.CLASS_Link not in labels:
+            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
+                                              msg="This node type is not Link")
+        # edges to interfaces/connection points will disappear
+        self.delete_node(node_id=node_id)
+
+    def remove_ns_with_cps_and_links(self, node_id: str):
+        """
+        Remove network service with subtending interfaces and links
+        :param node_id:
+        :return:
+        """
+        # check we are a network service
+        labels, node_props = self.get_node_properties(node_id=node_id)
+        if ABCPropertyGraph.CLASS_NetworkService not in labels:
+            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
+                                              msg="This node type is not NetworkService")
+        self.delete_nodes(node_ids=self._collect_ns_subtree_ids(node_id=node_id, already=set()))
+
+    def remove_cp_and_links(self, node_id: str):
+        """
+        Remove ConnectionPoint and links. Parent ConnectionPoints and links are removed
+        if they have no other children or other connected connection points.
+        :param node_id: interface node id
+        :return:
+        """
+        self.delete_nodes(node_ids=self._collect_cp_and_link_ids(node_id=node_id, already=set()))
+
+    @staticmethod
+    def _flatten_ns_sliver(ns: NetworkServiceSliver, parent_node_id: str,
+                           nodes_by_label: Dict, edges_by_rel: Dict):
+        """
+        Append a network service sliver and its interfaces to per-label/per-relationship
+        node and edge partitions
+        :param ns:
+        :param parent_node_id: may be None for slice-wide network services
+        :param nodes_by_label:
+        :param edges_by_rel:
+        :return:
+        """
+        nodes_by_label[ABCPropertyGraph.CLASS_NetworkService].append(
+            (ns.node_id, ABCPropertyGraph.network_service_sliver_to_graph_properties_dict(ns)))
+        if parent_node_id is not None:
+            edges_by_rel[ABCPropertyGraph.REL_HAS].append((parent_node_id, ns.node_id))
+        if ns.interface_info is not None:
+            cp_nodes = nodes_by_label[ABCPropertyGraph.CLASS_ConnectionPoint]
+            connects = edges_by_rel[ABCPropertyGraph.REL_CONNECTS]
+            for i in ns.interface_info.interfaces.values():
+                cp_nodes.append((i.node_id,
+                                 ABCPropertyGraph.interface_sliver_to_graph_properties_dict(i)))
+                connects.append((ns.node_id, i.node_id))
+
+    @staticmethod
+    def _flatten_node_sliver(sliver: NodeSliver, nodes_by_label: Dict, edges_by_rel: Dict):
+        """
+        Walk a deep node sliver, partitioning (node_id, props) tuples by class label
+        and (node_a, node_b) tuples by relationship - the layout bulk writes want
+        :param sliver:
+        :param nodes_by_label:
+        :param edges_by_rel:
+        :return:
+        """
+        nodes_by_label[ABCPropertyGraph.CLASS_NetworkNode].append(
+            (sliver.node_id, ABCPropertyGraph.node_sliver_to_graph_properties_dict(sliver)))
+        aci = sliver.attached_components_info
+        if aci is not None:
+            for csliver in aci.devices.values():
+                nodes_by_label[ABCPropertyGraph.CLASS_Component].append(
+                    (csliver.node_id,
+                     ABCPropertyGraph.component_sliver_to_graph_properties_dict(csliver)))
+                edges_by_rel[ABCPropertyGraph.REL_HAS].append((sliver.node_id, csliver.node_id))
+                if csliver.network_service_info is not None:
+                    for ns in csliver.network_service_info.network_services.values():
+                        ABCPropertyGraph._flatten_ns_sliver(ns, csliver.node_id,
+                                                            nodes_by_label, edges_by_rel)
+        nsi = sliver.network_service_info
+        if nsi is not None:
+            for ns in nsi.network_services.values():
+                ABCPropertyGraph._flatten_ns_sliver(ns, sliver.node_id,
+                                                    nodes_by_label, edges_by_rel)
 
     def add_network_node_sliver(self, *, sliver: NodeSliver):
 
@@ -1153,20 +1524,11 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
             raise PropertyGraphQueryException(msg=f'Node name {sliver.resource_name} must be unique.',
                                               graph_id=self.graph_id, node_id=None)
 
-        props = self.node_sliver_to_graph_properties_dict(sliver)
-        self.add_node(node_id=sliver.node_id, label=ABCPropertyGraph.CLASS_NetworkNode, props=props)
-        # if components aren't empty, add components, their network services and interfaces
-        aci = sliver.attached_components_info
-        if aci is not None:
-            for csliver in aci.devices.values():
-                self.add_component_sliver(parent_node_id=sliver.node_id,
-                                          component=csliver)
-        # if network services arent empty add them with their interfaces
-        nsi = sliver.network_service_info
-        if nsi is not None:
-            for ns in nsi.network_services.values():
-                self.add_network_service_sliver(parent_node_id=sliver.node_id,
-                                                network_service=ns)
+        # flatten the sliver tree (components, their network services and interfaces)
+        # and hand it to the backend as one batch
+        nodes_by_label, edges_by_rel = defaultdict(list), defaultdict(list)
+        self._flatten_node_sliver(sliver, nodes_by_label, edges_by_rel)
+        self.bulk_add(nodes_by_label=nodes_by_label, edges_by_rel=edges_by_rel)
 
     def add_network_link_sliver(self, *, lsliver: NetworkLinkSliver, interfaces: List[str]):
 
@@ -1249,13 +1611,11 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         :return:
         """
         assert link_id is not None
-        # check this is a link
-        labels, parent_props = self.get_node_properties(node_id=link_id)
-        if ABCPropertyGraph.CLASS_Link not in labels and ABCPropertyGraph.CLASS_NetworkService not in labels:
-            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=link_id,
-                                              msg="Node type is not Link or a NetworkService")
-        return self.get_first_neighbor(node_id=link_id, rel=ABCPropertyGraph.REL_CONNECTS,
-                                       node_label=ABCPropertyGraph.CLASS_ConnectionPoint)
+        # label check on the parent is fused into the neighbor query
+        return self.get_first_neighbor_checked(node_id=link_id,
+                                               parent_labels=_LINK_OR_NS_LABELS,
+                                               rel=ABCPropertyGraph.REL_CONNECTS,
+                                               node_label=ABCPropertyGraph.CLASS_ConnectionPoint)
 
     def get_all_node_or_component_connection_points(self, parent_node_id: str) -> List[str]:
         """
@@ -1265,20 +1625,14 @@ class ABCPropertyGraph(ABCPropertyGraphConstants):
         """
         assert parent_node_id is not None
         labels, parent_props = self.get_node_properties(node_id=parent_node_id)
-        if ABCPropertyGraph.CLASS_NetworkNode not in labels and \
-                ABCPropertyGraph.CLASS_Component not in labels and \
-                ABCPropertyGraph.CLASS_CompositeNode not in labels:
+        if _NODE_COMPONENT_OR_COMPOSITE_LABELS.isdisjoint(labels):
             raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=parent_node_id,
                                               msg="Parent node type is not NetworkNode, CompositeNode or Component")
-        nss_ifs = self.get_first_and_second_neighbor(node_id=parent_node_id, rel1=ABCPropertyGraph.REL_HAS,
-                                                     node1_label=ABCPropertyGraph.CLASS_NetworkService,
-                                                     rel2=ABCPropertyGraph.REL_CONNECTS,
-                                                     node2_label=ABCPropertyGraph.CLASS_ConnectionPoint)
-        ret = list()
         # return only interface IDs, not interested in NetworkServices
-        for tup in nss_ifs:
-            ret.append(tup[1])
-        return ret
+        return self.get_second_neighbors(node_id=parent_node_id, rel1=ABCPropertyGraph.REL_HAS,
+                                         node1_label=ABCPropertyGraph.CLASS_NetworkService,
+                                         rel2=ABCPropertyGraph.REL_CONNECTS,
+                                         node2_label=ABCPropertyGraph.CLASS_ConnectionPoint)
 
     def get_parent(self, node_id: str, rel: str, parent: str) -> Tuple[str, str]:
         """
@@ -1410,14 +1764,9 @@ class ABCGraphImporter(ABC):
         assert graph_file is not None
         assert new_graph_file is not None
 
-        # read using networkx
-        g = nx.read_graphml(graph_file)
-        # add node id to every node
-        for n in list(g.nodes):
-            if (node_id_prop not in g.nodes[n].keys()) or (len(g.nodes[n][node_id_prop]) == 0):
-                g.nodes[n][node_id_prop] = str(uuid.uuid4())
-        # save to a new file
-        GraphML.nx_write_graphml(g, new_graph_file)
+        # stream the GraphML through lxml adding node id where missing,
+        # rather than materializing the whole graph in networkx
+        GraphML.stream_networkx_to_neo4j(graph_file, new_graph_file, node_id_prop=node_id_prop)
 
     @staticmethod
     def enumerate_graph_nodes_to_string(*, graph_file: str, node_id_prop: str = "NodeID") -> str:
@@ -1432,8 +1781,9 @@ class ABCGraphImporter(ABC):
 
         # read using networkx
         g = nx.read_graphml(graph_file)
-        # add node id to every node
-        for n in list(g.nodes):
+        # add node id to every node; no need to materialize the node list
+        # since we only touch attributes
+        for n in g.nodes:
             if (node_id_prop not in g.nodes[n].keys()) or (len(g.nodes[n][node_id_prop]) == 0):
                 g.nodes[n][node_id_prop] = str(uuid.uuid4())
         graph_string = '\n'.join(nx.generate_graphml(g))
@@ -1480,11 +1830,21 @@ class ABCGraphImporter(ABC):
         if not g:
             raise PropertyGraphImportException(graph_id=None, msg=f'Unable to read graph {graph_file}')
 
+        return ABCGraphImporter.get_graph_id_from_graph(graph=g)
+
+    @staticmethod
+    def get_graph_id_from_graph(*, graph: nx.Graph) -> str:
+        """
+        Get the GraphID property common to all nodes of an already parsed
+        NetworkX graph
+        :param graph:
+        :return:
+        """
         # check graph_ids on nodes
         graph_ids = set()
         try:
-            for n in list(g.nodes):
-                graph_ids.add(g.nodes[n][ABCPropertyGraph.GRAPH_ID])
+            for n in graph.nodes:
+                graph_ids.add(graph.nodes[n][ABCPropertyGraph.GRAPH_ID])
         except KeyError:
             raise PropertyGraphImportException(graph_id=None, msg=f"Graph does not contain GraphID property")
 
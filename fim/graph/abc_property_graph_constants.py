@@ -55,6 +55,7 @@ class ABCPropertyGraphConstants(ABC):
     PROP_SITE = 'Site'
     PROP_LOCATION = 'Location'
     PROP_IMAGE_REF = 'ImageRef'
+    PROP_IMAGE_TYPE = 'ImageType'
     PROP_MGMT_IP = 'MgmtIp'
     PROP_ALLOCATION_CONSTRAINTS = 'AllocationConstraints'
     PROP_SERVICE_ENDPOINT = 'ServiceEndpoint'
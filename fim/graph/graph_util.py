@@ -23,6 +23,10 @@
 #
 #
 # Author: Ilya Baldin (ibaldin@renci.org)
+import uuid
+
+from contextlib import ExitStack
+
 from lxml import etree
 from io import StringIO
 import networkx as nx
@@ -34,6 +38,11 @@ Utilities package for working with graphs (Neo4j and NetworkX)
 
 class GraphML:
 
+    GRAPHML_NS = 'http://graphml.graphdrawing.org/xmlns'
+    # mirror ABCPropertyGraphConstants (not imported here to avoid circularity)
+    GRAPH_ID = 'GraphID'
+    NODE_ID = 'NodeID'
+
     @staticmethod
     def networkx_to_neo4j(graph_string: str) -> str:
         """
@@ -65,6 +74,103 @@ class GraphML:
                 n.set('labels', ':GraphNode:' + data.text)
         return etree.tostring(tree, method='xml').decode('utf-8')
 
+    @staticmethod
+    def stream_networkx_to_neo4j(source, dest_file_name: str, *, graph_id: str = None,
+                                 node_id_prop: str = None, require_node_id: bool = False) -> None:
+        """
+        Streaming (lxml iterparse) equivalent of networkx_to_neo4j that copies GraphML
+        from source (file name or file-like object) to dest_file_name without ever
+        holding the full document in memory. Optionally stamps graph_id into a
+        GraphID property of every node and/or assigns a fresh uuid4 to nodes missing
+        the node_id_prop property. If require_node_id is set (implied by graph_id),
+        every node must carry a non-empty NodeID or ValueError is raised.
+        """
+        ns = '{' + GraphML.GRAPHML_NS + '}'
+        # key ids (per GraphML 'for' scope) discovered in the header
+        node_keys = dict()
+        edge_keys = dict()
+
+        def find_data(elem, key_id):
+            if key_id is None:
+                return None
+            return elem.find(f'{ns}data[@key="{key_id}"]')
+
+        def set_data(elem, key_id, text):
+            data = find_data(elem, key_id)
+            if data is None:
+                data = etree.SubElement(elem, f'{ns}data')
+                data.set('key', key_id)
+            data.text = text
+
+        with ExitStack() as stack:
+            xf = stack.enter_context(etree.xmlfile(dest_file_name, encoding='utf-8'))
+            root_ctx = graph_ctx = None
+            for event, elem in etree.iterparse(source, events=('start', 'end')):
+                tag = etree.QName(elem).localname
+                if event == 'start':
+                    if tag == 'graphml' and root_ctx is None:
+                        root_ctx = xf.element(elem.tag, dict(elem.attrib), nsmap=elem.nsmap)
+                        root_ctx.__enter__()
+                    elif tag == 'graph' and graph_ctx is None:
+                        # declare keys for properties we inject, unless the header had them
+                        for prop in (GraphML.GRAPH_ID if graph_id is not None else None, node_id_prop):
+                            if prop is not None and prop not in node_keys:
+                                key = etree.Element(f'{ns}key', id=prop)
+                                key.set('attr.name', prop)
+                                key.set('attr.type', 'string')
+                                key.set('for', 'node')
+                                xf.write(key)
+                                node_keys[prop] = prop
+                        graph_ctx = xf.element(elem.tag, dict(elem.attrib))
+                        graph_ctx.__enter__()
+                    continue
+                if tag == 'key':
+                    keys = edge_keys if elem.get('for') == 'edge' else node_keys
+                    keys[elem.get('attr.name')] = elem.get('id')
+                    xf.write(elem)
+                    elem.clear()
+                elif tag == 'data' or tag == 'desc':
+                    # node- and edge-scoped data travel inside their parent
+                    # element when it is written; graph-scoped data and desc
+                    # (graph attributes like Description) have no such carrier
+                    # and must be written through on their own
+                    parent = elem.getparent()
+                    if parent is not None and etree.QName(parent).localname == 'graph':
+                        xf.write(elem)
+                        elem.clear()
+                elif tag == 'node':
+                    data = find_data(elem, node_keys.get('Class'))
+                    if not elem.get('labels') and data is not None:
+                        # to make NetworkX and Neo4j exports as similar as possible
+                        # add 'GraphNode' label to all nodes too (neo4j does it)
+                        elem.set('labels', ':GraphNode:' + data.text)
+                    if node_id_prop is not None:
+                        node_id = find_data(elem, node_keys.get(node_id_prop))
+                        if node_id is None or not node_id.text:
+                            set_data(elem, node_keys[node_id_prop], str(uuid.uuid4()))
+                    if require_node_id or graph_id is not None:
+                        node_id = find_data(elem, node_keys.get(GraphML.NODE_ID))
+                        if node_id is None or not node_id.text:
+                            raise ValueError("Some nodes are missing NodeID property, unable to import")
+                    if graph_id is not None:
+                        set_data(elem, node_keys[GraphML.GRAPH_ID], graph_id)
+                    xf.write(elem)
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                elif tag == 'edge':
+                    data = find_data(elem, edge_keys.get('Class'))
+                    if not elem.get('label') and data is not None:
+                        elem.set('label', data.text)
+                    xf.write(elem)
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                elif tag == 'graph':
+                    graph_ctx.__exit__(None, None, None)
+                elif tag == 'graphml':
+                    root_ctx.__exit__(None, None, None)
+
     @staticmethod
     def nx_write_graphml(graph: nx.Graph, file_name: str):
         """
@@ -28,15 +28,18 @@ Neo4j-specific implementation of property graph abstraction
 """
 from typing import Dict, Any, Tuple, List, Set
 
+import functools
 import logging
-import shutil
 import os
+import secrets
 import tempfile
 import uuid
 import time
 import json
-import networkx as nx
+from collections import defaultdict
+from io import BytesIO
 from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError
 
 from .abc_property_graph import ABCPropertyGraph, PropertyGraphImportException, \
     PropertyGraphQueryException, ABCGraphImporter, GraphFormat
@@ -46,11 +49,83 @@ from .graph_util import GraphML
 APOC_RETRY_COUNT = 10
 
 
+@functools.lru_cache(maxsize=None)
+def _load_rules(rules_file: str) -> Tuple:
+    """
+    Load and parse a JSON validation rules file once per path
+    """
+    with open(rules_file) as f:
+        # tuple so the cached value is immutable
+        return tuple(json.load(f))
+
+
 class Neo4jPropertyGraph(ABCPropertyGraph):
     """
     Neo4j-specific implementation of property graph abstraction
     """
 
+    # hot-path queries hoisted to class scope so they are built once;
+    # QUERY_* are used verbatim, TEMPLATE_* take labels or relationship
+    # types (which cannot be bound as Cypher parameters) via _cached_query
+    QUERY_GET_NODE_PROPS = "MATCH (n:GraphNode {GraphID: $graphId, NodeID: $nodeId}) " \
+                           "RETURN labels(n), properties(n)"
+    QUERY_LIST_NODE_IDS = "MATCH (n:GraphNode {GraphID: $graphId}) RETURN n.NodeID as nodeId"
+    # batched so large graphs don't blow the transaction memory ceiling;
+    # not parallel - concurrent detach deletes deadlock on shared relationships
+    QUERY_DELETE_GRAPH = "CALL apoc.periodic.iterate(" \
+                         "'MATCH (n:GraphNode {GraphID: $gid}) RETURN n', 'DETACH DELETE n', " \
+                         "{batchSize: 10000, parallel: false, params: {gid: $graphId}})"
+    QUERY_DELETE_NODES = "MATCH (n:GraphNode {GraphID: $graphId}) WHERE n.NodeID IN $nodeIds " \
+                         "DETACH DELETE n"
+    QUERY_GET_LINK_PROPS ="MATCH (a:GraphNode {GraphID:$graphId, NodeID:$nodeA}) -[r]- " \
+                           "(b:GraphNode {GraphID:$graphId, NodeID:$nodeB}) RETURN type(r), properties(r)"
+    QUERY_UPDATE_NODE_PROPS = "MATCH (s:GraphNode {GraphID: $graphId, NodeID: $nodeId}) " \
+                              "SET s+= $props RETURN properties(s)"
+    TEMPLATE_NODES_BY_CLASS = "MATCH (n:{0} {{GraphID: $graphId}}) RETURN collect(n.NodeID) as nodeids"
+    TEMPLATE_NODES_BY_CLASS_AND_TYPE = "MATCH(n:{0} {{GraphID: $graphId, Type: $ntype}}) " \
+                                       "RETURN collect(n.NodeID) as nodeids"
+    TEMPLATE_UPDATE_NODE_PROP = "MATCH (s:GraphNode {{GraphID: $graphId, NodeID: $nodeId}}) " \
+                                "SET s+={{ {0}: $propVal}} RETURN properties(s)"
+    TEMPLATE_FIRST_NEIGHBOR = "match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[:{0}]- " \
+                              "(b:GraphNode:{1} {{ GraphID: $graphId}}) return b.NodeID"
+    TEMPLATE_FIRST_NEIGHBOR_CHECKED = "match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) " \
+                                      "optional match (a) -[:{0}]- (b:GraphNode:{1} {{GraphID: $graphId}}) " \
+                                      "return labels(a), collect(b.NodeID)"
+    TEMPLATE_FIRST_NEIGHBOR_BY_NAME ="match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[:{0}]- " \
+                                      "(b:GraphNode:{1} {{ GraphID: $graphId, Name: $name}}) return b.NodeID"
+    TEMPLATE_FIRST_AND_SECOND_NEIGHBOR = \
+        "match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[:{0}]- " \
+        "(b:GraphNode:{1} {{GraphID: $graphId}}) -[:{2}]- " \
+        "(c:GraphNode:{3} {{GraphID: $graphId}}) WHERE $nodeA <> c.NodeID return b.NodeID, c.NodeID"
+    TEMPLATE_SECOND_NEIGHBORS = \
+        "match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[:{0}]- " \
+        "(b:GraphNode:{1} {{GraphID: $graphId}}) -[:{2}]- " \
+        "(c:GraphNode:{3} {{GraphID: $graphId}}) WHERE $nodeA <> c.NodeID return distinct c.NodeID"
+    TEMPLATE_SUBTREE = \
+        "match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeId}}) " \
+        "optional match (a) -[:{0}*1..{1}]- (b:GraphNode {{GraphID: $graphId}}) " \
+        "with [a] + collect(distinct b) as subtree " \
+        "unwind subtree as x " \
+        "optional match (x) -[r]- (y) where y in subtree and type(r) in $rels " \
+        "with x, collect(distinct [type(r), y.NodeID]) as nbrs " \
+        "return collect([x.NodeID, labels(x), properties(x), nbrs]) as rows"
+    TEMPLATE_BULK_ADD_NODES = "UNWIND $rows AS row CREATE (n:GraphNode:{0}) SET n = row"
+    TEMPLATE_BULK_ADD_EDGES = "UNWIND $rows AS row " \
+                              "MATCH (a:GraphNode {{GraphID: $graphId, NodeID: row.a}}) " \
+                              "MATCH (b:GraphNode {{GraphID: $graphId, NodeID: row.b}}) " \
+                              "CREATE (a)-[r:{0} {{Class: '{0}'}}]->(b)"
+    TEMPLATE_NODE_UNIQUE ="MATCH (n:GraphNode:{0} {{GraphID: $graphId, Name: $name}}) " \
+                           "RETURN collect(n.NodeID) as nodeids"
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _cached_query(template: str, *args) -> str:
+        """
+        Format a class-scope query template with labels/relationship types,
+        caching the built string so repeated calls don't re-format.
+        """
+        return template.format(*args)
+
     def __init__(self, *, graph_id: str, importer, logger=None):
         """
         Initialize a property graph object. Logger is optional.
@@ -64,12 +139,11 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
 
     def _validate_graph(self, rules_file: str) -> None:
         """ validate the graph imported in Neo4j according to a set of given Cypher rules"""
-        f = open(rules_file)
-        rules_dict = json.load(f)
-        f.close()
+        rules_dict = _load_rules(rules_file)
 
-        for r in rules_dict:
-            with self.driver.session() as session:
+        # one session for all rules - avoids per-rule connection acquisition
+        with self.driver.session() as session:
+            for r in rules_dict:
                 #print('Applying rule ', r['msg'])
                 single = session.run(r['rule'], graphId=self.graph_id).single()
                 if single is None:
@@ -90,6 +164,21 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
             self.log.info(f'Checking JSON properties of graph {self.graph_id}')
             self._validate_all_json_properties()
 
+    @staticmethod
+    def _check_delete_result(val, graph_id: str) -> None:
+        """
+        apoc.periodic.iterate reports batch failures in its returned stats
+        instead of raising - surface them so a partial delete doesn't pass
+        silently
+        :param val: single record returned by QUERY_DELETE_GRAPH
+        :param graph_id:
+        :return:
+        """
+        if val is not None and val['failedBatches'] > 0:
+            raise PropertyGraphQueryException(
+                graph_id=graph_id, node_id=None,
+                msg=f"Unable to delete graph: {val['errorMessages']}")
+
     def delete_graph(self) -> None:
         """
         Delete a graph from Neo4j
@@ -97,11 +186,12 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         """
         self.log.debug(f'Deleting graph {self.graph_id}')
         with self.driver.session() as session:
-            session.run('match (n:GraphNode {GraphID: $graphId })detach delete n', graphId=self.graph_id)
+            val = session.run(self.QUERY_DELETE_GRAPH, graphId=self.graph_id).single()
+        self._check_delete_result(val, self.graph_id)
 
     def get_all_nodes_by_class(self, *, label: str) -> List[str]:
         assert label is not None
-        query = f"MATCH (n:{label} {{GraphID: $graphId}}) RETURN collect(n.NodeID) as nodeids"
+        query = self._cached_query(self.TEMPLATE_NODES_BY_CLASS, label)
         with self.driver.session() as session:
             val = session.run(query, graphId=self.graph_id).single()
             if val is None:
@@ -112,7 +202,7 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
     def get_all_nodes_by_class_and_type(self, *, label: str, ntype: str) -> List[str]:
         assert label is not None
         assert ntype is not None
-        query = f"MATCH(n:{label} {{GraphID: $graphId, Type: $ntype}}) RETURN collect(n.NodeID) as nodeids"
+        query = self._cached_query(self.TEMPLATE_NODES_BY_CLASS_AND_TYPE, label)
         with self.driver.session() as session:
             val = session.run(query, graphId=self.graph_id, ntype=ntype).single()
             if val is None:
@@ -125,13 +215,28 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         List all NodeID properties of nodes in a graph
         :return:
         """
-        query = "MATCH (n:GraphNode {GraphID: $graphId}) RETURN collect(n.NodeID) as nodeids"
-        with self.driver.session() as session:
-            val = session.run(query, graphId=self.graph_id).single()
-            if val is None:
-                raise PropertyGraphQueryException(graph_id=self.graph_id,
-                                                  node_id=None, msg="Unable to list graph nodes")
-            return val.data()['nodeids']
+        # stream individual records instead of collect()ing server-side -
+        # avoids materializing the full list in Neo4j heap for large graphs
+        with self.driver.session(fetch_size=10000) as session:
+            return [r['nodeId'] for r in session.run(self.QUERY_LIST_NODE_IDS, graphId=self.graph_id)]
+
+    def _get_node_properties(self, *, session, node_id: str) -> (List[str], Dict[str, Any]):
+        """
+        get_node_properties variant that reuses a caller-provided session so
+        loops over many nodes don't pay per-call session acquisition.
+        :param session:
+        :param node_id:
+        :return: (list, dict)
+        """
+        val = session.run(self.QUERY_GET_NODE_PROPS, graphId=self.graph_id, nodeId=node_id).single()
+        if val is None:
+            raise PropertyGraphQueryException(graph_id=self.graph_id,
+                                              node_id=node_id, msg="Unable to find node")
+        # index into the record directly - record.data() converts the whole
+        # record to a dict (twice, the way this was written before)
+        labels = val[0]
+        labels.remove('GraphNode')
+        return labels, val[1]
 
     def get_node_properties(self, *, node_id: str) -> (List[str], Dict[str, Any]):
         """
@@ -141,15 +246,33 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         :return: (list, dict)
         """
         assert node_id is not None
-        query = "MATCH (n:GraphNode {GraphID: $graphId, NodeID: $nodeId}) RETURN labels(n), properties(n)"
         with self.driver.session() as session:
-            val = session.run(query, graphId=self.graph_id, nodeId=node_id).single()
-            if val is None:
+            return self._get_node_properties(session=session, node_id=node_id)
+
+    def _validate_all_json_properties(self) -> None:
+        """
+        Overrides the base implementation with a single bulk query returning
+        just the JSON-encoded properties of every node, instead of a full
+        per-node property fetch (one round-trip instead of one per node).
+        :return:
+        """
+        query = "MATCH (n:GraphNode {GraphID: $graphId}) " \
+                "RETURN n.NodeID as nodeId, [prop IN $props | n[prop]] as vals"
+        with self.driver.session() as session:
+            res = session.run(query, graphId=self.graph_id,
+                              props=ABCPropertyGraph.JSON_PROPERTY_NAMES)
+            count = 0
+            for record in res:
+                count += 1
+                props = dict(zip(ABCPropertyGraph.JSON_PROPERTY_NAMES, record['vals']))
+                prop_tuple = self._validate_json_property(node_id=record['nodeId'], props=props)
+                if prop_tuple is not None:
+                    raise PropertyGraphImportException(graph_id=self.graph_id, node_id=record['nodeId'],
+                                                       msg=f"Unable to parse JSON property {prop_tuple[0]} "
+                                                           f"with value {prop_tuple[1]}")
+            if count == 0:
                 raise PropertyGraphQueryException(graph_id=self.graph_id,
-                                                  node_id=node_id, msg="Unable to find node")
-            labels = val.data()['labels(n)']
-            labels.remove('GraphNode')
-            return labels, val.data()['properties(n)']
+                                                  node_id=None, msg="Unable to list nodes of graph")
 
     def get_node_json_property_as_object(self, *, node_id: str, prop_name: str) -> Any:
         """
@@ -182,13 +305,11 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         """
         assert node_a is not None
         assert node_b is not None
-        query = f"MATCH (a:GraphNode {{GraphID:$graphId, NodeID:$nodeA}}) -[r]- " \
-            f"(b:GraphNode {{GraphID:$graphId, NodeID:$nodeB}}) RETURN type(r), properties(r)"
         with self.driver.session() as session:
-            val = session.run(query, graphId=self.graph_id, nodeA=node_a, nodeB=node_b).single()
+            val = session.run(self.QUERY_GET_LINK_PROPS, graphId=self.graph_id, nodeA=node_a, nodeB=node_b).single()
             if val is None:
                 raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_a, msg="Link doesn't exist")
-            return val.data()['type(r)'], val.data()['properties(r)']
+            return val[0], val[1]
 
     def update_node_property(self, *, node_id: str, prop_name: str, prop_val: Any) -> None:
         """
@@ -201,8 +322,7 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         assert node_id is not None
         assert prop_name is not None
         assert prop_val is not None
-        query = f"MATCH (s:GraphNode {{GraphID: $graphId, NodeID: $nodeId}}) " \
-            f"SET s+={{ {prop_name}: $propVal}} RETURN properties(s)"
+        query = self._cached_query(self.TEMPLATE_UPDATE_NODE_PROP, prop_name)
         with self.driver.session() as session:
             val = session.run(query, graphId=self.graph_id, nodeId=node_id, propVal=prop_val)
             if val is None or len(val.value()) == 0:
@@ -251,17 +371,10 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         assert node_id is not None
         assert props is not None
 
-        all_props = ""
-        for k, v in props.items():
-            all_props += f"{k}: '{v}', "
-        if len(all_props) > 2:
-            all_props = all_props[:-2]
-
-        query = f"MATCH (s:GraphNode {{GraphID: $graphId, NodeID: $nodeId}}) " \
-            f"SET s+= {{ {all_props} }} RETURN properties(s)"
-
+        # bind the whole dict as a map parameter - keeps the query plan cacheable
+        # and avoids quoting/injection issues of string-built property maps
         with self.driver.session() as session:
-            val = session.run(query, graphId=self.graph_id, nodeId=node_id)
+            val = session.run(self.QUERY_UPDATE_NODE_PROPS, graphId=self.graph_id, nodeId=node_id, props=props)
             if val is None or len(val.value()) == 0:
                 raise PropertyGraphQueryException(graph_id=self.graph_id,
                                                   node_id=node_id,
@@ -321,16 +434,12 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         assert kind is not None
         assert props is not None
 
-        all_props = ""
-        for k, v in props.items():
-            all_props += f'{k}: "{v}", '
-        if len(all_props) > 2:
-            all_props = all_props[:-2]
-
-        query = "MATCH (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[r:{kind}]- " \
-            f"(b:GraphNode {{GraphID: $graphId, NodeID:$nodeB}}) SET r+= {{ {all_props} }} RETURN properties(s)"
+        # bind the whole dict as a map parameter - only the relationship type
+        # has to be interpolated into the query text
+        query = f"MATCH (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[r:{kind}]- " \
+            f"(b:GraphNode {{GraphID: $graphId, NodeID:$nodeB}}) SET r+= $props RETURN properties(r)"
         with self.driver.session() as session:
-            val = session.run(query, graphId=self.graph_id, nodeA=node_a, nodeB=node_b)
+            val = session.run(query, graphId=self.graph_id, nodeA=node_a, nodeB=node_b, props=props)
             if val is None or len(val.value()) == 0:
                 raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_a,
                                                   node_b=node_b, kind=kind,
@@ -427,14 +536,90 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         assert node_id is not None
         assert rel is not None
         assert node_label is not None
-        query = f"match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[:{rel}]- " \
-                f"(b:GraphNode:{node_label} {{ GraphID: $graphId}}) return b.NodeID"
+        query = self._cached_query(self.TEMPLATE_FIRST_NEIGHBOR, rel, node_label)
         with self.driver.session() as session:
             val = session.run(query, graphId=self.graph_id, nodeA=node_id).value()
             if val is None:
                 return list()
             return val
 
+    def get_subtree_properties(self, *, node_id: str, rels: List[str], max_depth: int) -> \
+            Tuple[Dict[str, Tuple[List[str], Dict[str, Any]]], Dict[str, List[Tuple[str, str]]]]:
+        """
+        Return labels, properties and adjacency of all nodes reachable from
+        this node over the specified relationships within max_depth hops -
+        a single variable-length query instead of a round-trip per node.
+        :param node_id:
+        :param rels:
+        :param max_depth:
+        :return:
+        """
+        assert node_id is not None
+        assert rels
+        query = self._cached_query(self.TEMPLATE_SUBTREE, '|'.join(rels), max_depth)
+        with self.driver.session() as session:
+            val = session.run(query, graphId=self.graph_id, nodeId=node_id,
+                              rels=list(rels)).single()
+        if val is None or not val[0]:
+            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
+                                              msg="Unable to find node")
+        nodes = dict()
+        adjacency = dict()
+        for nid, labels, props, nbrs in val[0]:
+            labels.remove('GraphNode')
+            nodes[nid] = (labels, props)
+            # the optional match leaves a [null, null] pair on edge-less nodes
+            adjacency[nid] = [(r, nbr) for r, nbr in nbrs if r is not None]
+        return nodes, adjacency
+
+    def get_first_neighbor_checked(self, *, node_id: str, parent_labels: Set[str],
+                                   rel: str, node_label: str) -> List[str]:
+        """
+        Same as get_first_neighbor, but the parent label check and the traversal
+        are fused into a single query instead of two round-trips.
+        :param node_id:
+        :param parent_labels: acceptable labels/classes of the parent node
+        :param rel:
+        :param node_label:
+        :return:
+        """
+        assert node_id is not None
+        assert rel is not None
+        assert node_label is not None
+        query = self._cached_query(self.TEMPLATE_FIRST_NEIGHBOR_CHECKED, rel, node_label)
+        with self.driver.session() as session:
+            val = session.run(query, graphId=self.graph_id, nodeA=node_id).single()
+            if val is None:
+                raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
+                                                  msg="Unable to find node")
+            labels, neighbors = val.values()
+        if parent_labels.isdisjoint(labels):
+            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=node_id,
+                                              msg=f"Node type is not {' or '.join(sorted(parent_labels))}")
+        return neighbors
+
+    def get_first_neighbor_by_name(self, *, node_id: str, rel: str, node_label: str, name: str) -> List[str]:
+        """
+        Return a list of ids of nodes of this label with this Name property related
+        via relationship. Pushes the name predicate into the query so only matching
+        neighbors cross the driver boundary. List may be empty.
+        :param node_id:
+        :param rel:
+        :param node_label:
+        :param name:
+        :return:
+        """
+        assert node_id is not None
+        assert rel is not None
+        assert node_label is not None
+        assert name is not None
+        query = self._cached_query(self.TEMPLATE_FIRST_NEIGHBOR_BY_NAME, rel, node_label)
+        with self.driver.session() as session:
+            val = session.run(query, graphId=self.graph_id, nodeA=node_id, name=name).value()
+            if val is None:
+                return list()
+            return val
+
     def get_first_and_second_neighbor(self, *, node_id: str, rel1: str, node1_label: str,
                                       rel2: str, node2_label: str) -> List:
         """
@@ -453,15 +638,40 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         assert rel2 is not None
         assert node2_label is not None
 
-        query = f"match (a:GraphNode {{GraphID: $graphId, NodeID: $nodeA}}) -[:{rel1}]- "\
-                f"(b:GraphNode:{node1_label} {{GraphID: $graphId}}) -[:{rel2}]- "\
-                f"(c:GraphNode:{node2_label} {{GraphID: $graphId}}) WHERE $nodeA <> c.NodeID return b.NodeID, c.NodeID"
+        query = self._cached_query(self.TEMPLATE_FIRST_AND_SECOND_NEIGHBOR,
+                                   rel1, node1_label, rel2, node2_label)
         with self.driver.session() as session:
             val = session.run(query, graphId=self.graph_id, nodeA=node_id).values()
             if val is None:
                 return list()
             return val
 
+    def get_second_neighbors(self, *, node_id: str, rel1: str, node1_label: str,
+                             rel2: str, node2_label: str) -> List[str]:
+        """
+        Return a list of distinct ids of the second neighbors only - the
+        intermediate column never crosses the driver boundary. List may be empty.
+        :param node_id:
+        :param rel1:
+        :param node1_label:
+        :param rel2:
+        :param node2_label:
+        :return:
+        """
+        assert node_id is not None
+        assert rel1 is not None
+        assert node1_label is not None
+        assert rel2 is not None
+        assert node2_label is not None
+
+        query = self._cached_query(self.TEMPLATE_SECOND_NEIGHBORS,
+                                   rel1, node1_label, rel2, node2_label)
+        with self.driver.session() as session:
+            val = session.run(query, graphId=self.graph_id, nodeA=node_id).value()
+            if val is None:
+                return list()
+            return val
+
     def delete_node(self, *, node_id: str):
         """
         Delete node from a graph (incident edges automatically deleted)
@@ -473,6 +683,43 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         with self.driver.session() as session:
             session.run(query, graphId=self.graph_id, nodeId=node_id).single()
 
+    def bulk_add(self, *, nodes_by_label: Dict, edges_by_rel: Dict) -> None:
+        """
+        Add a batch of nodes and edges with one UNWIND query per label and per
+        relationship type instead of one query per element
+        :param nodes_by_label: label -> list of (node_id, properties dict)
+        :param edges_by_rel: relationship -> list of (node_a, node_b)
+        :return:
+        """
+        with self.driver.session() as session:
+            for label, node_rows in nodes_by_label.items():
+                rows = list()
+                for node_id, props in node_rows:
+                    # same implicit properties add_node sets
+                    row = {'Class': label, 'GraphID': self.graph_id, 'NodeID': node_id}
+                    if props:
+                        row.update(props)
+                    rows.append(row)
+                query = self._cached_query(self.TEMPLATE_BULK_ADD_NODES, label)
+                session.run(query, rows=rows).consume()
+            for rel, edge_rows in edges_by_rel.items():
+                query = self._cached_query(self.TEMPLATE_BULK_ADD_EDGES, rel)
+                session.run(query, graphId=self.graph_id,
+                            rows=[{'a': a, 'b': b} for a, b in edge_rows]).consume()
+
+    def delete_nodes(self, *, node_ids) -> None:
+        """
+        Delete multiple nodes from a graph in a single query
+        (incident edges automatically deleted)
+        :param node_ids: iterable of node ids
+        :return:
+        """
+        node_ids = list(node_ids)
+        if len(node_ids) == 0:
+            return
+        with self.driver.session() as session:
+            session.run(self.QUERY_DELETE_NODES, graphId=self.graph_id, nodeIds=node_ids).consume()
+
     def node_exists(self, *, node_id: str, label: str):
         """
         Check if this node exists
@@ -597,7 +844,7 @@ class Neo4jPropertyGraph(ABCPropertyGraph):
         assert label is not None
         assert name is not None
 
-        query = f"MATCH (n:GraphNode:{label} {{GraphID: $graphId, Name: $name}}) RETURN collect(n.NodeID) as nodeids"
+        query = self._cached_query(self.TEMPLATE_NODE_UNIQUE, label)
         with self.driver.session() as session:
             val = session.run(query, graphId=self.graph_id, name=name).single()
             if val is None or len(val.data()) == 0 or len(val.data()['nodeids']) == 0:
@@ -680,24 +927,41 @@ class Neo4jGraphImporter(ABCGraphImporter):
 
     index_initialized = False
 
-    def __init__(self, *, url: str, user: str, pswd: str, import_host_dir: str, import_dir: str, logger=None):
+    def __init__(self, *, url: str, user: str, pswd: str, import_host_dir: str, import_dir: str, logger=None,
+                 max_connection_pool_size: int = None, connection_acquisition_timeout: float = 60,
+                 max_connection_lifetime: float = 3600, connection_timeout: float = 30,
+                 keep_alive: bool = True):
         """
         URL of Neo4j instance, credentials and directory
-        from where Neo4j can import graphs.
+        from where Neo4j can import graphs. Connection pool parameters
+        have sane defaults; pool size can also be set via FIM_NEO4J_POOL
+        environment variable.
         :param url:
         :param user:
         :param pswd:
         :param import_host_dir: as seen outside Neo4j docker.
         :param import_dir: as seen by neo4j, set to None if neo4j not in Docker
         :param logger:
+        :param max_connection_pool_size: defaults to $FIM_NEO4J_POOL or 32
+        :param connection_acquisition_timeout: in seconds
+        :param max_connection_lifetime: in seconds
+        :param connection_timeout: in seconds
+        :param keep_alive: keep pooled connections alive between operations
         """
         self.url = url
         self.user = user
         self.pswd = pswd
         self.import_host_dir = import_host_dir
         self.import_dir = import_dir
+        if max_connection_pool_size is None:
+            max_connection_pool_size = int(os.getenv('FIM_NEO4J_POOL', '32'))
         try:
-            self.driver = GraphDatabase.driver(self.url, auth=(user, pswd))
+            self.driver = GraphDatabase.driver(self.url, auth=(user, pswd),
+                                               max_connection_pool_size=max_connection_pool_size,
+                                               connection_acquisition_timeout=connection_acquisition_timeout,
+                                               max_connection_lifetime=max_connection_lifetime,
+                                               connection_timeout=connection_timeout,
+                                               keep_alive=keep_alive)
             # per https://neo4j.com/developer-blog/neo4j-driver-best-practices/
             self.driver.verify_connectivity()
         except Exception as e:
@@ -742,49 +1006,104 @@ class Neo4jGraphImporter(ABCGraphImporter):
                              f'most likely because the indexes are '
                              f'already installed. If in doubt you can use ":schema" command to see them.')
 
-    def _prep_graph(self, graph: str, graph_id: str = None) -> Tuple[str, str, str]:
+    def _stream_to_import_file(self, source, host_file_name: str, graph_id: str = None) -> None:
         """
-        Import a graphml graph, assigning it a new unique graph ID to GraphID property
-        (overwrite if there already). return the name of the file where graph is saved
-        with updated GraphID and the assigned graphID
-        :param graph:
+        Stream GraphML from source into an import file, removing the partially
+        written file before re-raising if the transform fails mid-stream
+        (malformed XML, missing NodeID etc.)
+        :param source:
+        :param host_file_name:
+        :param graph_id:
+        :return:
+        """
+        try:
+            GraphML.stream_networkx_to_neo4j(source, host_file_name, graph_id=graph_id)
+        except Exception:
+            if os.path.exists(host_file_name):
+                os.unlink(host_file_name)
+            raise
+
+    def _prep_graph_source(self, source, graph_id: str = None) -> Tuple[str, str, str]:
+        """
+        Prep a graphml graph from a file name or file-like object, assigning it
+        a new unique graph ID unless provided. Return the assigned graph id, the
+        name of the import file on the host and its name as seen by Neo4j.
+        :param source:
         :param graph_id:
         :return:
         """
         if graph_id is None:
             graph_id = str(uuid.uuid4())
 
-        # massage the GraphML in case it came from non-compliant NetworkX or older version
-        graph = GraphML.networkx_to_neo4j(graph)
-
-        # save to file
-        with tempfile.NamedTemporaryFile(suffix="-graphml", mode='w') as f1:
-            f1.write(graph)
-            f1.flush()
-            # read using networkx
-            g = nx.read_graphml(f1.name)
-
-        # ovewrite graph id on every node and check that NodeID is present
-        for n in list(g.nodes):
-            if not g.nodes[n].get('NodeID', None):
-                raise PropertyGraphImportException(graph_id=graph_id,
-                                                   msg="Some nodes are missing NodeID property, unable to import")
-            g.nodes[n][ABCPropertyGraph.GRAPH_ID] = graph_id
-
-        # save back to GraphML
         # where to save is determined by whether importDir is set
         dest_dir = self.import_host_dir
         if dest_dir is None:
             dest_dir = tempfile.gettempdir()
 
-        uniq_name = str(uuid.uuid4())
+        uniq_name = secrets.token_hex(16)
         host_file_name = os.path.join(dest_dir, uniq_name)
         mapped_file_name = os.path.join(self.import_dir, uniq_name)
 
-        GraphML.nx_write_graphml(g, host_file_name)
+        # stream the GraphML straight into the import file, massaging it for Neo4j
+        # (in case it came from non-compliant NetworkX or older version) and checking
+        # that NodeID is present, without ever building an in-memory copy of the graph.
+        # GraphID is stamped into every node of the file so the post-import labeling
+        # in _import_graph stays scoped to this graph and cannot adopt unrelated
+        # nodes (e.g. from a concurrent import or a failed partial one).
+        try:
+            self._stream_to_import_file(source, host_file_name, graph_id=graph_id)
+        except ValueError as e:
+            raise PropertyGraphImportException(graph_id=graph_id, msg=str(e))
 
         return graph_id, host_file_name, mapped_file_name
 
+    def _prep_graph(self, graph: str, graph_id: str = None) -> Tuple[str, str, str]:
+        """
+        Prep a graphml graph passed as a string (see _prep_graph_source)
+        :param graph:
+        :param graph_id:
+        :return:
+        """
+        return self._prep_graph_source(BytesIO(graph.encode('utf-8')), graph_id)
+
+    def _import_with_retry(self, *, graph_id: str, host_file_name: str, mapped_file_name: str) -> None:
+        """
+        Import a prepped file into Neo4j retrying on transient APOC errors,
+        unlinking the import file afterwards.
+        :param graph_id:
+        :param host_file_name:
+        :param mapped_file_name:
+        :return:
+        """
+        retry = APOC_RETRY_COUNT
+        while retry > 0:
+            try:
+                # something in APOC prevents loading sometimes on some platforms
+                self.log.debug(f"Trying to load the file {mapped_file_name}")
+                self._import_graph(mapped_file_name, graph_id)
+                retry = -5
+            except PropertyGraphImportException as e:
+                # transient errors are already retried by the driver inside
+                # execute_write; only intermittent APOC failures (surfacing as
+                # ClientError) warrant a delete and full reimport
+                if not isinstance(e.__cause__, ClientError):
+                    self.log.debug(f"Unlinking temporary file {host_file_name}")
+                    os.unlink(host_file_name)
+                    raise
+                self.log.warning(f"APOC error, unable to load, deleting and reimporting graph {graph_id}")
+                retry -= 1
+                self.delete_graph(graph_id=graph_id)
+                # sleep and try again
+                time.sleep(1.0)
+
+        # remove the file
+        self.log.debug(f"Unlinking temporary file {host_file_name}")
+        os.unlink(host_file_name)
+
+        if retry == 0:
+            raise PropertyGraphImportException(graph_id=graph_id,
+                                               msg='Unable to load graph after multiple attempts')
+
     def _import_graph(self, graphml_file: str, graph_id: str) -> None:
         """
         import graph into neo4j giving every node a label GraphNode
@@ -801,14 +1120,22 @@ class Neo4jGraphImporter(ABCGraphImporter):
         try:
             with self.driver.session() as session:
                 self.log.debug(f"Loading graph {graph_id} into Neo4j")
-                session.run(
-                    'call apoc.import.graphml( $fileName, {batchSize: 10000, '
-                    'readLabels: true, storeNodeIds: true } ) ',
-                    fileName=graphml_file).single()
-                # force one common label on all imported nodes
+                session.execute_write(
+                    lambda tx: tx.run(
+                        'call apoc.import.graphml( $fileName, {batchSize: 10000, '
+                        'readLabels: true, storeNodeIds: true } ) ',
+                        fileName=graphml_file).single())
+                # force one common label on all freshly imported nodes; every
+                # import path writes GraphID into the file before the APOC
+                # import, so the stamp is scoped to this graph only. Batched
+                # via apoc.periodic.iterate so 100k+ node imports don't hit
+                # the transaction memory ceiling
                 self.log.debug(f"Adding GraphNode label to graph {graph_id}")
-                query_string = "MATCH (n {GraphID: $graphId }) SET n:GraphNode"
-                session.run(query_string, graphId=graph_id)
+                query_string = "CALL apoc.periodic.iterate(" \
+                               "'MATCH (n {GraphID: $gid}) RETURN n', " \
+                               "'SET n:GraphNode', " \
+                               "{batchSize: 10000, parallel: false, params: {gid: $graphId}})"
+                session.run(query_string, graphId=graph_id).single()
                 # convert class property into a label as well
                 #self.log.debug(f"Converting Class property into Neo4j label for all nodes")
                 #query_string = "MATCH (n {GraphID: $graphId }) " \
@@ -821,7 +1148,9 @@ class Neo4jGraphImporter(ABCGraphImporter):
                 #session.run(query_string, graphId=graph_id)
         except Exception as e:
             msg = f"Neo4j APOC import error {str(e)}"
-            raise PropertyGraphImportException(graph_id=graph_id, msg=msg)
+            # chain the original error so callers can tell retryable APOC
+            # ClientErrors from everything else
+            raise PropertyGraphImportException(graph_id=graph_id, msg=msg) from e
 
     def import_graph_from_string(self, *, graph_string: str, graph_id: str = None) -> Neo4jPropertyGraph:
         """
@@ -842,28 +1171,33 @@ class Neo4jGraphImporter(ABCGraphImporter):
         if graph_id is not None:
             assert assigned_id == graph_id
 
-        retry = APOC_RETRY_COUNT
-        while retry > 0:
-            try:
-                # something in APOC prevents loading sometimes on some platforms
-                self.log.debug(f"Trying to load the file {mapped_file_name}")
-                self._import_graph(mapped_file_name, assigned_id)
-                retry = -5
-            except PropertyGraphImportException:
-                self.log.warning(f"Transient error, unable to load, deleting and reimporting graph {assigned_id}")
-                retry -= 1
-                self.delete_graph(graph_id=assigned_id)
-                # sleep and try again
-                time.sleep(1.0)
+        self._import_with_retry(graph_id=assigned_id, host_file_name=host_file_name,
+                                mapped_file_name=mapped_file_name)
 
-        # remove the file
-        self.log.debug(f"Unlinking temporary file {host_file_name}")
-        #print(f'LEAVING TEMPORARY FILE {host_file_name}')
-        os.unlink(host_file_name)
+        return Neo4jPropertyGraph(graph_id=assigned_id, importer=self, logger=self.log)
 
-        if retry == 0:
-            raise PropertyGraphImportException(graph_id=assigned_id,
-                                               msg='Unable to load graph after multiple attempts')
+    def import_graph_from_file(self, *, graph_file: str, graph_id: str = None) -> Neo4jPropertyGraph:
+        """
+        import a graph from a file, streaming it directly into the import
+        directory instead of reading it into a string and writing it back out
+        :param graph_file: - path to graph file (GraphML)
+        :param graph_id: - optional id of the graph in the database
+        :return:
+        """
+        assert graph_file is not None
+
+        self.log.debug(f'Importing graph with id {graph_id} from {graph_file}')
+        try:
+            assigned_id, host_file_name, mapped_file_name = self._prep_graph_source(graph_file, graph_id)
+        except Exception as e:
+            msg = f"NetworkX graph error {str(e)}"
+            raise PropertyGraphImportException(graph_id=graph_id, msg=msg)
+
+        if graph_id is not None:
+            assert assigned_id == graph_id
+
+        self._import_with_retry(graph_id=assigned_id, host_file_name=host_file_name,
+                                mapped_file_name=mapped_file_name)
 
         return Neo4jPropertyGraph(graph_id=assigned_id, importer=self, logger=self.log)
 
@@ -876,40 +1210,18 @@ class Neo4jGraphImporter(ABCGraphImporter):
         # save string to temp file
         dest_dir = self.import_host_dir
         assert dest_dir is not None
-        uniq_name = str(uuid.uuid4())
+        uniq_name = secrets.token_hex(16)
         # need both host file name and what is seen from inside Docker
         host_file_name = os.path.join(dest_dir, uniq_name)
         mapped_file_name = os.path.join(self.import_dir, uniq_name)
 
-        graph_string = GraphML.networkx_to_neo4j(graph_string)
-
-        with open(host_file_name, 'w') as f:
-            f.write(graph_string)
+        self._stream_to_import_file(BytesIO(graph_string.encode('utf-8')), host_file_name)
 
         # get graph id
         graph_id = self.get_graph_id(graph_file=host_file_name)
 
-        retry = APOC_RETRY_COUNT
-        while retry > 0:
-            try:
-                # something in APOC prevents loading sometimes on some platforms
-                self.log.debug(f"Trying to load the file {mapped_file_name}")
-                self._import_graph(mapped_file_name, graph_id)
-                retry = -5
-            except PropertyGraphImportException:
-                self.log.warning(f"Transient error, unable to load, deleting and reimporting graph {graph_id}")
-                retry -= 1
-                self.delete_graph(graph_id=graph_id)
-                # sleep and try again
-                time.sleep(1.0)
-
-        # unlink temp file
-        self.log.debug(f"Unlinking temporary file {host_file_name}")
-        os.unlink(host_file_name)
-
-        if retry == 0:
-            raise PropertyGraphImportException(graph_id=graph_id,
-                                               msg='Unable to load graph after multiple attempts')
+        self._import_with_retry(graph_id=graph_id, host_file_name=host_file_name,
+                                mapped_file_name=mapped_file_name)
 
         return Neo4jPropertyGraph(graph_id=graph_id, importer=self, logger=self.log)
 
@@ -924,20 +1236,14 @@ class Neo4jGraphImporter(ABCGraphImporter):
         # copy file
         dest_dir = self.import_host_dir
         assert dest_dir is not None
-        uniq_name = str(uuid.uuid4())
+        uniq_name = secrets.token_hex(16)
         # need both host file name and what is seen from inside Docker
         host_file_name = os.path.join(dest_dir, uniq_name)
         mapped_file_name = os.path.join(self.import_dir, uniq_name)
 
-        #shutil.copyfile(graph_file, host_file_name)
-
-        with open(graph_file, 'r') as f:
-            graph_string = f.read()
-
-        graph_string = GraphML.networkx_to_neo4j(graph_string)
-        with open(host_file_name, 'w') as f:
-            f.write(graph_string)
-            f.flush()
+        # a plain copy (or hard link) won't do - the GraphML has to be massaged
+        # for Neo4j on the way in; the streaming transform is a single pass
+        self._stream_to_import_file(graph_file, host_file_name)
 
         # get graph id
         graph_id = self.get_graph_id(graph_file=host_file_name)
@@ -967,7 +1273,8 @@ class Neo4jGraphImporter(ABCGraphImporter):
         """
         self.log.debug(f'Deleting graph {graph_id}')
         with self.driver.session() as session:
-            session.run('match (n:GraphNode {GraphID: $graphId })detach delete n', graphId=graph_id)
+            val = session.run(Neo4jPropertyGraph.QUERY_DELETE_GRAPH, graphId=graph_id).single()
+        Neo4jPropertyGraph._check_delete_result(val, graph_id)
 
     def cast_graph(self, *, graph_id: str) -> ABCPropertyGraph:
 
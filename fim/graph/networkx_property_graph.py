@@ -26,12 +26,12 @@
 """
 NetworkX-specific implementation of property graph abstraction
 """
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Tuple
 
 import logging
 import uuid
 import json
-import tempfile
+from io import StringIO
 import networkx as nx
 import networkx_query as nxq
 from threading import Lock
@@ -444,6 +444,57 @@ class NetworkXPropertyGraph(ABCPropertyGraph, NetworkXMixin):
         # convert internal IDs into real IDs
         return self._get_node_ids_for_list(graph, real_first_neighbors)
 
+    def get_subtree_properties(self, *, node_id: str, rels: List[str], max_depth: int) -> \
+            Tuple[Dict[str, Tuple[List[str], Dict[str, Any]]], Dict[str, List[Tuple[str, str]]]]:
+        """
+        Return labels, properties and adjacency of all nodes reachable from
+        this node over the specified relationships within max_depth hops -
+        one BFS over the in-memory graph.
+        :param node_id:
+        :param rels:
+        :param max_depth:
+        :return:
+        """
+        assert node_id is not None
+        assert rels
+
+        # extract a graph
+        graph = self.storage.extract_graph(self.graph_id)
+        if graph is None:
+            raise PropertyGraphQueryException(graph_id=self.graph_id,
+                                              msg="Unable to find graph")
+        real_node = self._find_node(node_id=node_id)
+        rel_set = set(rels)
+        # BFS over internal ids following only the requested relationships
+        visited = {real_node}
+        frontier = [real_node]
+        for _ in range(max_depth):
+            next_frontier = list()
+            for n in frontier:
+                for nbr in graph.neighbors(n):
+                    if nbr in visited:
+                        continue
+                    if graph.edges[(n, nbr)].get(NetworkXMixin.NETWORKX_LABEL, None) not in rel_set:
+                        continue
+                    visited.add(nbr)
+                    next_frontier.append(nbr)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        nodes = dict()
+        adjacency = dict()
+        for n in visited:
+            props = graph.nodes[n].copy()
+            label = props.pop(self.NETWORKX_LABEL)
+            nid = props[ABCPropertyGraph.NODE_ID]
+            nodes[nid] = ([label], props)
+            adjacency[nid] = [(graph.edges[(n, nbr)].get(self.NETWORKX_LABEL, None),
+                               graph.nodes[nbr][ABCPropertyGraph.NODE_ID])
+                              for nbr in graph.neighbors(n)
+                              if nbr in visited and
+                              graph.edges[(n, nbr)].get(self.NETWORKX_LABEL, None) in rel_set]
+        return nodes, adjacency
+
     def get_first_and_second_neighbor(self, *, node_id: str, rel1: str, node1_label: str, rel2: str,
                                       node2_label: str) -> List:
         """
@@ -842,6 +893,36 @@ class NetworkXGraphImporter(ABCGraphImporter):
 
         return nx.relabel_nodes(graph, name_map, copy)
 
+    @staticmethod
+    def _read_from_string_json_nodelink(graph_string: str) -> Any:
+        """
+        Read in the graph as a JSON_NODELINK format from a string
+        """
+        return nx.readwrite.node_link_graph(data=json.loads(graph_string))
+
+    @staticmethod
+    def _read_from_string_graphml(graph_string: str) -> Any:
+        """
+        Read in the graph as a GraphML format from a string
+        """
+        return nx.read_graphml(StringIO(graph_string))
+
+    def _read_from_string(self, graph_string: str, format_hint: str or None = None) -> Any:
+        """
+        Read NetworkX graph from a string using different formats (avoids the
+        temp-file round-trip of _read_from_file). If format hint is specified,
+        try that, otherwise try all methods in order
+        """
+        if format_hint:
+            return self.__getattribute__('_read_from_string_' + format_hint)(graph_string)
+        else:
+            for fmt in self.READ_FORMATS:
+                try:
+                    return self.__getattribute__('_read_from_string_' + fmt)(graph_string)
+                except:
+                    continue
+            return None
+
     @staticmethod
     def _read_from_file_json_nodelink(file_name: str) -> Any:
         """
@@ -886,15 +967,12 @@ class NetworkXGraphImporter(ABCGraphImporter):
         if graph_id is None:
             graph_id = str(uuid.uuid4())
 
-        with tempfile.NamedTemporaryFile(suffix="-graphml", mode='w') as f1:
-            f1.write(graph_string)
-            f1.flush()
-            graph = self._read_from_file(f1.name)
-            if graph:
-                self.storage.add_graph(graph_id=graph_id, graph=graph)
-            else:
-                raise PropertyGraphImportException(graph_id=graph_id,
-                                                   msg=f'Unable to import graph from string')
+        graph = self._read_from_string(graph_string)
+        if graph:
+            self.storage.add_graph(graph_id=graph_id, graph=graph)
+        else:
+            raise PropertyGraphImportException(graph_id=graph_id,
+                                               msg=f'Unable to import graph from string')
 
         return self.graph_class(graph_id=graph_id, importer=self, logger=self.log)
 
@@ -907,17 +985,13 @@ class NetworkXGraphImporter(ABCGraphImporter):
         """
         assert graph_string is not None
 
-        with tempfile.NamedTemporaryFile(suffix="-graphml", mode='w') as f1:
-            f1.write(graph_string)
-            f1.flush()
-            # get graph id (kinda inefficient, because reads graph in, then discards)
-            graph_id = self.get_graph_id(graph_file=f1.name)
-            graph = self._read_from_file(f1.name)
-            if graph:
-                self.storage.add_graph_direct(graph_id=graph_id, graph=graph)
-            else:
-                raise PropertyGraphImportException(graph_id=graph_id,
-                                                   msg=f'Unable to import graph from string')
+        graph = self._read_from_string(graph_string)
+        if not graph:
+            raise PropertyGraphImportException(graph_id=None,
+                                               msg=f'Unable to import graph from string')
+        # get graph id from the graph we already parsed
+        graph_id = self.get_graph_id_from_graph(graph=graph)
+        self.storage.add_graph_direct(graph_id=graph_id, graph=graph)
 
         return self.graph_class(graph_id=graph_id, importer=self, logger=self.log) if graph_id is not None else None
 
@@ -34,6 +34,11 @@ import json
 
 from fim.graph.abc_property_graph import ABCPropertyGraph, PropertyGraphQueryException
 
+# prebuilt expected-label sets for the fused parent checks below
+_NODE_LABELS = frozenset({ABCPropertyGraph.CLASS_NetworkNode})
+_NODE_OR_COMPONENT_LABELS = frozenset({ABCPropertyGraph.CLASS_NetworkNode,
+                                       ABCPropertyGraph.CLASS_Component})
+
 
 class ABCASMPropertyGraph(ABCPropertyGraph, metaclass=ABCMeta):
     """
@@ -118,12 +123,10 @@ class ABCASMPropertyGraph(ABCPropertyGraph, metaclass=ABCMeta):
         assert rel is not None
         assert parent_node_id is not None
 
-        neighbs = self.get_first_neighbor(node_id=parent_node_id, rel=rel, node_label=label)
-        for n in neighbs:
-            _, props = self.get_node_properties(node_id=n)
-            if props.get(ABCPropertyGraph.PROP_NAME, None) is not None and \
-                props[ABCPropertyGraph.PROP_NAME] == node_name:
-                return n
+        neighbs = self.get_first_neighbor_by_name(node_id=parent_node_id, rel=rel,
+                                                  node_label=label, name=node_name)
+        if len(neighbs) > 0:
+            return neighbs[0]
         raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=None,
                                           msg=f"Unable to find node with name {node_name} "
                                               f"class {label} as child of {parent_node_id}")
@@ -135,33 +138,29 @@ class ABCASMPropertyGraph(ABCPropertyGraph, metaclass=ABCMeta):
         :return:
         """
         assert parent_node_id is not None
-        # check that parent is a NetworkNode
-        labels, parent_props = self.get_node_properties(node_id=parent_node_id)
-        if ABCPropertyGraph.CLASS_NetworkNode not in labels:
-            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=parent_node_id,
-                                              msg="Parent node type is not NetworkNode")
-        return self.get_first_neighbor(node_id=parent_node_id, rel=ABCPropertyGraph.REL_HAS,
-                                       node_label=ABCPropertyGraph.CLASS_Component)
+        # label check on the parent is fused into the neighbor query
+        return self.get_first_neighbor_checked(node_id=parent_node_id,
+                                               parent_labels=_NODE_LABELS,
+                                               rel=ABCPropertyGraph.REL_HAS,
+                                               node_label=ABCPropertyGraph.CLASS_Component)
 
     def get_all_network_node_or_component_nss(self, parent_node_id: str) -> List[str]:
         assert parent_node_id is not None
-        # check that parent is a NetworkNode or Component
-        labels, parent_props = self.get_node_properties(node_id=parent_node_id)
-        if ABCPropertyGraph.CLASS_NetworkNode not in labels and \
-            ABCPropertyGraph.CLASS_Component not in labels:
-            raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=parent_node_id,
-                                              msg="Parent node type is not NetworkNode or Component")
-        return self.get_first_neighbor(node_id=parent_node_id, rel=ABCPropertyGraph.REL_HAS,
-                                       node_label=ABCPropertyGraph.CLASS_NetworkService)
+        # label check on the parent is fused into the neighbor query
+        return self.get_first_neighbor_checked(node_id=parent_node_id,
+                                               parent_labels=_NODE_OR_COMPONENT_LABELS,
+                                               rel=ABCPropertyGraph.REL_HAS,
+                                               node_label=ABCPropertyGraph.CLASS_NetworkService)
 
     def find_component_by_name(self, *, parent_node_id: str, component_name: str) -> str:
 
         assert component_name is not None
-        component_id_list = self.get_all_network_node_components(parent_node_id=parent_node_id)
-        for cid in component_id_list:
-            _, cprops = self.get_node_properties(node_id=cid)
-            if cprops[ABCPropertyGraph.PROP_NAME] == component_name:
-                return cid
+        component_id_list = self.get_first_neighbor_by_name(node_id=parent_node_id,
+                                                            rel=ABCPropertyGraph.REL_HAS,
+                                                            node_label=ABCPropertyGraph.CLASS_Component,
+                                                            name=component_name)
+        if len(component_id_list) > 0:
+            return component_id_list[0]
         raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=None,
                                           msg=f"Unable to find component with name {component_name}")
 
@@ -169,11 +168,12 @@ class ABCASMPropertyGraph(ABCPropertyGraph, metaclass=ABCMeta):
 
         assert nsname is not None
 
-        ns_id_list = self.get_all_network_node_or_component_nss(parent_node_id=parent_node_id)
-        for cid in ns_id_list:
-            _, cprops = self.get_node_properties(node_id=cid)
-            if cprops[ABCPropertyGraph.PROP_NAME] == nsname:
-                return cid
+        ns_id_list = self.get_first_neighbor_by_name(node_id=parent_node_id,
+                                                     rel=ABCPropertyGraph.REL_HAS,
+                                                     node_label=ABCPropertyGraph.CLASS_NetworkService,
+                                                     name=nsname)
+        if len(ns_id_list) > 0:
+            return ns_id_list[0]
         raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=None,
                                           msg=f"Unable to find NetworkService with name {nsname}")
 
@@ -181,11 +181,12 @@ class ABCASMPropertyGraph(ABCPropertyGraph, metaclass=ABCMeta):
 
         assert iname is not None
 
-        if_id_list = self.get_all_ns_or_link_connection_points(link_id=parent_node_id)
-        for cid in if_id_list:
-            _, cprops = self.get_node_properties(node_id=cid)
-            if cprops[ABCPropertyGraph.PROP_NAME] == iname:
-                return cid
+        if_id_list = self.get_first_neighbor_by_name(node_id=parent_node_id,
+                                                     rel=ABCPropertyGraph.REL_CONNECTS,
+                                                     node_label=ABCPropertyGraph.CLASS_ConnectionPoint,
+                                                     name=iname)
+        if len(if_id_list) > 0:
+            return if_id_list[0]
         raise PropertyGraphQueryException(graph_id=self.graph_id, node_id=None,
                                           msg=f"Unable to find ConnectionPoint with name {iname}")
 
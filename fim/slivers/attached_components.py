@@ -49,6 +49,8 @@ class ComponentType(enum.Enum):
 
 class ComponentSliver(BaseSliver):
 
+    __slots__ = ('network_service_info',)
+
     NAME_REGEX = r'^[\w\-_\.\ ]{2,255}$'
 
     def __init__(self):
@@ -62,9 +64,7 @@ class ComponentSliver(BaseSliver):
     def type_from_str(ctype: str) -> ComponentType or None:
         if ctype is None:
             return None
-        for t in ComponentType:
-            if ctype == str(t):
-                return t
+        return ComponentType.__members__.get(ctype)
 
     def diff(self, other_sliver) -> TopologyDiff or None:
         raise RuntimeError('Not implemented')
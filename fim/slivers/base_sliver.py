@@ -40,6 +40,15 @@ from fim.slivers.topology_diff import TopologyDiff, WhatsModifiedFlag
 class BaseSliver(ABC):
     """Base class for all sliver types"""
 
+    # slivers are created and populated by the thousand when deserializing
+    # graphs; __slots__ avoids a per-instance __dict__. Every subclass must
+    # declare __slots__ as well (empty if it adds no attributes).
+    __slots__ = ('resource_type', 'resource_name', 'resource_model', 'capacities',
+                 'capacity_hints', 'labels', 'capacity_delegations', 'label_delegations',
+                 'capacity_allocations', 'label_allocations', 'reservation_info',
+                 'structural_info', 'node_id', 'details', 'node_map', 'stitch_node',
+                 'tags', 'flags', 'mf_data', 'user_data', 'layout_data', 'boot_script')
+
     BOOST_SCRIPT_SIZE = 1024
 
     @abstractmethod
@@ -241,10 +250,12 @@ class BaseSliver(ABC):
         """
         supports diffing slivers
         """
-        result = {'added': {k: dict_b[k] for k in set(dict_b) - set(dict_a)},
-                  'removed': {k: dict_a[k] for k in set(dict_a) - set(dict_b)}}
+        # dict key views support set operations directly - no need to copy
+        # the keys into throwaway sets
+        result = {'added': {k: dict_b[k] for k in dict_b.keys() - dict_a.keys()},
+                  'removed': {k: dict_a[k] for k in dict_a.keys() - dict_b.keys()}}
         if show_value_diff:
-            common_keys = set(dict_a) & set(dict_b)
+            common_keys = dict_a.keys() & dict_b.keys()
             result['value_diffs'] = {
                 k: (dict_a[k], dict_b[k])
                 for k in common_keys
@@ -257,7 +268,7 @@ class BaseSliver(ABC):
         """
         common keys between slivers, returns slivers from first dict that match
         """
-        result = {k: dict_a[k] for k in set(dict_a) & set(dict_b)}
+        result = {k: dict_a[k] for k in dict_a.keys() & dict_b.keys()}
         return result
 
     @abstractmethod
@@ -333,6 +344,23 @@ class BaseSliver(ABC):
             exists = False
         return exists
 
+    def __setstate__(self, state):
+        # accept pickles made both before __slots__ were introduced
+        # (plain __dict__ state) and after (None, slots dict); skip
+        # attributes this version of the class no longer has
+        if isinstance(state, tuple):
+            sources = state
+        else:
+            sources = (state,)
+        for src in sources:
+            if not src:
+                continue
+            for k, v in src.items():
+                try:
+                    setattr(self, k, v)
+                except AttributeError:
+                    pass
+
     def __repr__(self):
         exclude_set = {"get_property", "get_stitch_node"}
         print_set = list()
@@ -360,6 +388,8 @@ class BaseSliverWithDelegation(BaseSliver):
     """
     Intended to be used in advertisements
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         self.capacity_delegations = None
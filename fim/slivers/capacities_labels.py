@@ -37,6 +37,12 @@ import fim.logging.fim_logger as fl
 
 class JSONField(ABC):
 
+    # Cached raw JSON form of the instance set by from_json. Kept in a slot
+    # so it stays invisible to the __dict__-driven methods of the subclasses
+    # (to_json, to_dict, arithmetic, comparison). Valid only until a field
+    # is written - see __setattr__ below.
+    __slots__ = ('_raw',)
+
     @classmethod
     def update(cls, lab, **kwargs):
         """
@@ -53,8 +59,17 @@ class JSONField(ABC):
         for k, v in lab.__dict__.items():
             inst.__setattr__(k, v)
         inst._set_fields(**kwargs)
+        if not kwargs:
+            # an exact copy can keep the raw JSON form of the original
+            inst._raw = getattr(lab, '_raw', None)
         return inst
 
+    def __setattr__(self, key, value):
+        # any field write invalidates the cached raw JSON form
+        if key != '_raw' and getattr(self, '_raw', None) is not None:
+            object.__delattr__(self, '_raw')
+        object.__setattr__(self, key, value)
+
     @abstractmethod
     def _set_fields(self, forgiving=False, **kwargs):
         """
@@ -70,6 +85,10 @@ class JSONField(ABC):
         If there are no values in the object, returns empty string.
         :return:
         """
+        raw = getattr(self, '_raw', None)
+        if raw is not None:
+            # unmodified since from_json - skip the re-serialization
+            return raw
         d = self.__dict__.copy()
         for k in self.__dict__:
             if d[k] is None or d[k] == 0:
@@ -92,6 +111,7 @@ class JSONField(ABC):
         # we make constructing from JSON more forgiving to allow some limited
         # forward compatibility, in case the fields change
         ret._set_fields(forgiving=True, **d)
+        ret._raw = json_string
         return ret
 
     def to_dict(self) -> Dict[str, str] or None:
@@ -57,6 +57,8 @@ class InterfaceType(enum.Enum):
 
 class InterfaceSliver(BaseSliver):
 
+    __slots__ = ('peer_labels',)
+
     NAME_REGEX = r'^[\w\-+_/\.\ :]{1,255}$'
 
     def __init__(self):
@@ -76,9 +78,7 @@ class InterfaceSliver(BaseSliver):
     def type_from_str(ntype: str) -> InterfaceType:
         if ntype is None:
             return None
-        for t in InterfaceType:
-            if ntype == str(t):
-                return t
+        return InterfaceType.__members__.get(ntype)
 
     def diff(self, other_sliver) -> TopologyDiff or None:
         raise RuntimeError('Not implemented')
@@ -45,10 +45,8 @@ class MaintenanceState(enum.Enum):
 
     @classmethod
     def from_string(cls, s: str):
-        for ms in MaintenanceState:
-            if s == ms.name:
-                return cls(ms)
-        return None
+        # __members__ is a precomputed name-to-member mapping
+        return cls.__members__.get(s)
 
 
 class EnhancedJSONEncoder(json.JSONEncoder):
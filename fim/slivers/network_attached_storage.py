@@ -31,6 +31,8 @@ class NetworkAttachedStorageSliver(NodeSliver):
     # maps onto NetworkNode
     GRAPH_LABEL = 'NetworkNode'
 
+    __slots__ = ('technology',)
+
     def __init__(self):
         super().__init__()
         self.technology = None
@@ -51,10 +51,8 @@ class LinkType(enum.Enum):
 
     @classmethod
     def from_string(cls, s: str):
-        for lt in LinkType:
-            if s == lt.name:
-                return cls(lt)
-        return None
+        # __members__ is a precomputed name-to-member mapping
+        return cls.__members__.get(s)
 
 
 LinkConstraintRecord = recordclass('LinkConstraintRecord',
@@ -64,6 +62,8 @@ LinkConstraintRecord = recordclass('LinkConstraintRecord',
 
 class NetworkLinkSliver(BaseSliver):
 
+    __slots__ = ('layer', 'technology')
+
     NAME_REGEX = r'^[\w\-+_/\.\ :]{2,255}$'
 
     """
@@ -55,10 +55,8 @@ class NodeType(enum.Enum):
 
     @classmethod
     def from_string(cls, s: str):
-        for nt in NodeType:
-            if s == nt.name:
-                return cls(nt)
-        return None
+        # __members__ is a precomputed name-to-member mapping
+        return cls.__members__.get(s)
 
 
 NodeConstraintRecord = recordclass('NodeConstraintRecord',
@@ -68,6 +66,10 @@ NodeConstraintRecord = recordclass('NodeConstraintRecord',
 
 class NodeSliver(BaseSliver):
 
+    __slots__ = ('management_ip', 'attached_components_info', 'allocation_constraints',
+                 'image_type', 'image_ref', 'service_endpoint', 'network_service_info',
+                 'site', 'location', 'maintenance_info')
+
     NAME_REGEX = r'^[\w\-\.]{2,255}$'
 
     NodeConstraints = {
@@ -247,5 +249,7 @@ class CompositeNodeSliver(NodeSliver):
     """
     Does the same thing as NodeSliver, but want to distinguish the class
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
\ No newline at end of file
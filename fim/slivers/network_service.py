@@ -49,10 +49,8 @@ class NSLayer(enum.Enum):
 
     @classmethod
     def from_string(cls, s: str):
-        for la in NSLayer:
-            if la.name == s:
-                return cls(la)
-        return None
+        # __members__ is a precomputed name-to-member mapping
+        return cls.__members__.get(s)
 
 
 class MirrorDirection(enum.Enum):
@@ -68,10 +66,8 @@ class MirrorDirection(enum.Enum):
 
     @classmethod
     def from_string(cls, s: str):
-        for md in MirrorDirection:
-            if md.name == s:
-                return cls(md)
-        return None
+        # __members__ is a precomputed name-to-member mapping
+        return cls.__members__.get(s)
 
 
 class ServiceType(enum.Enum):
@@ -119,6 +115,10 @@ ServiceConstraintRecord = recordclass('ServiceConstraintRecord',
 
 class NetworkServiceSliver(BaseSliver):
 
+    __slots__ = ('layer', 'technology', 'interface_info', 'allocation_constraints',
+                 'ero', 'path_info', 'controller_url', 'site', 'gateway',
+                 'mirror_port', 'mirror_direction')
+
     NAME_REGEX = r'^[\w\-_\.]{2,255}$'
 
     # whenever there is no limit, num is set to 0
@@ -343,17 +343,13 @@ class NetworkServiceSliver(BaseSliver):
     def type_from_str(ltype: str) -> ServiceType or None:
         if ltype is None:
             return None
-        for t in ServiceType:
-            if ltype == str(t):
-                return t
+        return ServiceType.__members__.get(ltype)
 
     @staticmethod
     def layer_from_str(layer: str) -> NSLayer or None:
         if layer is None:
             return None
-        for t in NSLayer:
-            if layer == str(t):
-                return t
+        return NSLayer.from_string(layer)
 
     def diff(self, other_sliver) -> TopologyDiff or None:
         if not other_sliver:
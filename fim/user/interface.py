@@ -145,7 +145,9 @@ class Interface(ModelElement):
     def get_peers(self, itype: InterfaceType = None) -> List[Any] or None:
         """
         Find 'peer' interfaces connected across a Link. Returns a list of Interface objects
-        (matching optional itype if specified, otherwise all).
+        (matching optional itype if specified, otherwise all). Runs a graph
+        traversal on every call - callers that need the result repeatedly
+        should hold on to it rather than re-query.
         :parm itype: optional type of peer interface we are looking for
         :return: peer Interface object or None
         """
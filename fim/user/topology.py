@@ -203,16 +203,25 @@ class Topology(ABC):
                  etype=ElementType.NEW, ntype=ntype, **kwargs)
         return n
 
-    def remove_node(self, name: str):
+    def remove_node(self, name: str = None, *, node_id: str = None):
         """
         Remove node and all its components, its interfaces and interfaces of components.
         Remove a matching ServicePort if connected to a NetworkService.
+        Node can be identified by name or directly by node_id - the latter
+        skips the name-based graph search.
         :param name:
+        :param node_id:
         :return:
         """
-        if name not in self.nodes.keys():
-            raise TopologyException(f'Node {name} is not in this topology.')
-        for i in self.nodes[name].interface_list:
+        if node_id is not None:
+            _, props = self.graph_model.get_node_properties(node_id=node_id)
+            node = Node(name=props[ABCPropertyGraph.PROP_NAME], node_id=node_id, topo=self)
+        else:
+            nodes = self.nodes
+            if name not in nodes.keys():
+                raise TopologyException(f'Node {name} is not in this topology.')
+            node = nodes[name]
+        for i in node.interface_list:
             # disconnect if connected to a network service
             peers = i.get_peers(itype=InterfaceType.ServicePort)
             if peers:
@@ -222,8 +231,7 @@ class Topology(ABC):
                 else:
                     raise TopologyException(f'Interface {i.name} has more than one peer, this is a model error.')
 
-        self.graph_model.remove_network_node_with_components_nss_cps_and_links(
-            node_id=self._get_node_by_name(name=name).node_id)
+        self.graph_model.remove_network_node_with_components_nss_cps_and_links(node_id=node.node_id)
 
     def add_facility(self, *, name: str, node_id: str = None, site: str,
                      nstype: ServiceType = ServiceType.VLAN,
@@ -319,13 +327,18 @@ class Topology(ABC):
                             etype=ElementType.NEW, interfaces=interfaces, technology=technology, **kwargs)
         return ns
 
-    def remove_network_service(self, name: str):
+    def remove_network_service(self, name: str = None, *, node_id: str = None):
         """
-        Remove a network service and associated service interfaces
+        Remove a network service and associated service interfaces. Service can
+        be identified by name or directly by node_id - the latter skips the
+        name-based graph search.
         :param name:
+        :param node_id:
         :return:
         """
-        self.graph_model.remove_ns_with_cps_and_links(node_id=self._get_ns_by_name(name=name).node_id)
+        if node_id is None:
+            node_id = self._get_ns_by_name(name=name).node_id
+        self.graph_model.remove_ns_with_cps_and_links(node_id=node_id)
 
     def _get_node_by_name(self, name: str) -> Node:
         """
@@ -27,6 +27,12 @@ class ModifyTest(unittest.TestCase):
              "import_host_dir": "neo4j/imports/",
              "import_dir": "/imports"}
 
+    # importer and serialized initial topology are cached at class scope by
+    # the first test; the rest reuse the driver connection pool and reload
+    # the cached string under fresh GUIDs
+    n4j_imp = None
+    _graph_A_string = None
+
     def initialTopo(self):
         """
         Define an initial topology before modify
@@ -52,13 +58,6 @@ class ModifyTest(unittest.TestCase):
 
         self.topoA.validate()
 
-        self.diff = TopologyDiff(added=TopologyDiffTuple(nodes=set(), components=set(),
-                                                         services=set(), interfaces=set()),
-                                 removed=TopologyDiffTuple(nodes=set(), components=set(),
-                                                           services=set(), interfaces=set()),
-                                 modified=TopologyDiffModifiedTuple(nodes=list(), components=list(),
-                                                                    services=list(), interfaces=list()))
-
     def modifyActions(self):
         """
         Define modify actions on the initial topo
@@ -111,8 +110,11 @@ class ModifyTest(unittest.TestCase):
         #
         # remove old node (will show up as removed), should also
         #
-        self.diff.removed.nodes.add(self.topoA.nodes['NodeC'])
-        self.topoB.remove_node(name='NodeC')
+        # NodeIDs are shared between topoA and topoB (topoB is a reload of
+        # topoA), so remove by id to skip the name-based graph search
+        node_c = self.topoA.nodes['NodeC']
+        self.diff.removed.nodes.add(node_c)
+        self.topoB.remove_node(node_id=node_c.node_id)
 
         self.topoB.validate()
 
@@ -122,8 +124,9 @@ class ModifyTest(unittest.TestCase):
         #
         # Remove the bridge service (as it now connects nothing)
         #
-        self.diff.removed.services.add(self.topoA.network_services['bridge1'])
-        self.topoB.remove_network_service(name='bridge1')
+        bridge1 = self.topoA.network_services['bridge1']
+        self.diff.removed.services.add(bridge1)
+        self.topoB.remove_network_service(node_id=bridge1.node_id)
 
         #
         # add a node and connect to bridge2 (need connect/disconnect on services)
@@ -131,9 +134,12 @@ class ModifyTest(unittest.TestCase):
         nF = self.topoB.add_node(name='NodeF', site='UKY')
         self.diff.added.nodes.add(nF)
         nic6 = nF.add_component(name='nic6', ctype=ComponentType.SharedNIC, model='ConnectX-6')
-        self.topoB.network_services['bridge2'].connect_interface(nic6.interface_list[0])
+        # hold on to the interface and its peer - interface_list and get_peers()
+        # each run a graph query per call
+        nic6_interface = nic6.interface_list[0]
+        self.topoB.network_services['bridge2'].connect_interface(nic6_interface)
         # add peer of this interface (that is attached to the service) to list of things we should find in a diff
-        self.diff.added.interfaces.add(nic6.interface_list[0].get_peers()[0])
+        self.diff.added.interfaces.add(nic6_interface.get_peers()[0])
 
         #
         # disconnect Node D from bridge2
@@ -157,21 +163,32 @@ class ModifyTest(unittest.TestCase):
     def setUp(self) -> None:
         if WITH_PROFILER: self.pr = cProfile.Profile()
 
-        self.n4j_imp = Neo4jGraphImporter(url=self.neo4j["url"], user=self.neo4j["user"],
-                                          pswd=self.neo4j["pass"],
-                                          import_host_dir=self.neo4j["import_host_dir"],
-                                          import_dir=self.neo4j["import_dir"])
+        if ModifyTest.n4j_imp is None:
+            ModifyTest.n4j_imp = Neo4jGraphImporter(url=self.neo4j["url"], user=self.neo4j["user"],
+                                                    pswd=self.neo4j["pass"],
+                                                    import_host_dir=self.neo4j["import_host_dir"],
+                                                    import_dir=self.neo4j["import_dir"])
         self.topoA = f.ExperimentTopology(importer=self.n4j_imp)
-        print(f'Created topology A with GUID {self.topoA.graph_model.graph_id}')
-        # create initial topology
-        self.initialTopo()
-        # serialize
-        graph_A_string = self.topoA.serialize()
+        if ModifyTest._graph_A_string is None:
+            print(f'Created topology A with GUID {self.topoA.graph_model.graph_id}')
+            # create initial topology and cache its serialized form so the
+            # remaining tests reload it instead of rebuilding node by node
+            self.initialTopo()
+            ModifyTest._graph_A_string = self.topoA.serialize()
+        else:
+            self.topoA.load(graph_string=ModifyTest._graph_A_string, new_graph_id=str(uuid.uuid4()))
+            print(f'Reloaded topology A with GUID {self.topoA.graph_model.graph_id}')
+        self.diff = TopologyDiff(added=TopologyDiffTuple(nodes=set(), components=set(),
+                                                         services=set(), interfaces=set()),
+                                 removed=TopologyDiffTuple(nodes=set(), components=set(),
+                                                           services=set(), interfaces=set()),
+                                 modified=TopologyDiffModifiedTuple(nodes=list(), components=list(),
+                                                                    services=list(), interfaces=list()))
         # load as topo B with alternate GUID, don't pass graph string
         # to constructor - it will re-use the GUID
         self.topoB = f.ExperimentTopology(importer=self.n4j_imp)
         new_id = str(uuid.uuid4())
-        self.topoB.load(graph_string=graph_A_string, new_graph_id=new_id)
+        self.topoB.load(graph_string=ModifyTest._graph_A_string, new_graph_id=new_id)
         print(f'Created topology B with new GUID {self.topoB.graph_model.graph_id}/{new_id}')
 
     @staticmethod
@@ -179,12 +196,22 @@ class ModifyTest(unittest.TestCase):
         if diff1 != diff2:
             raise Exception(f"Topology differences don't match in {where}")
 
+    @staticmethod
+    def _frozen_ids(elements: set[Any]) -> set:
+        # cheap stable identities, so set comparison hashes a small tuple
+        # per element instead of calling into model element __eq__/__hash__
+        return {(type(x).__name__, x.node_id) for x in elements}
+
     @staticmethod
     def compare_tuples(diff1: TopologyDiffTuple, diff2: TopologyDiffTuple):
-        ModifyTest.compare_sets(diff1.nodes, diff2.nodes, 'nodes')
-        ModifyTest.compare_sets(diff1.services, diff2.services, 'services')
-        ModifyTest.compare_sets(diff1.components, diff2.components, 'components')
-        ModifyTest.compare_sets(diff1.interfaces, diff2.interfaces, 'interfaces')
+        ModifyTest.compare_sets(ModifyTest._frozen_ids(diff1.nodes),
+                                ModifyTest._frozen_ids(diff2.nodes), 'nodes')
+        ModifyTest.compare_sets(ModifyTest._frozen_ids(diff1.services),
+                                ModifyTest._frozen_ids(diff2.services), 'services')
+        ModifyTest.compare_sets(ModifyTest._frozen_ids(diff1.components),
+                                ModifyTest._frozen_ids(diff2.components), 'components')
+        ModifyTest.compare_sets(ModifyTest._frozen_ids(diff1.interfaces),
+                                ModifyTest._frozen_ids(diff2.interfaces), 'interfaces')
 
     @staticmethod
     def compare_diffs(diff1: TopologyDiff, diff2: TopologyDiff):
@@ -192,8 +219,10 @@ class ModifyTest(unittest.TestCase):
         ModifyTest.compare_tuples(diff1.removed, diff2.removed)
 
     def tearDown(self) -> None:
-        pass
-        self.n4j_imp.delete_all_graphs()
+        # delete only the graphs this test created - an indexed GraphID
+        # delete instead of a full-database wipe
+        self.n4j_imp.delete_graph(graph_id=self.topoA.graph_model.graph_id)
+        self.n4j_imp.delete_graph(graph_id=self.topoB.graph_model.graph_id)
         if WITH_PROFILER:
             p = Stats(self.pr)
             p.strip_dirs()
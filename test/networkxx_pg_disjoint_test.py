@@ -25,17 +25,15 @@ class NetworkXPropertyGraphDisjointTests(unittest.TestCase):
         self.imp.delete_all_graphs()
 
     def _find_favorite_nodes(self, g=None) -> Dict[str, str]:
-        # find a few favorite nodes
+        # find a few favorite nodes in one pass over the graph
         if g is None:
             graph = self.g
         else:
             graph = g
-        ret = dict()
-        for f in self.FAVORITE_NODES:
-            for n in graph.storage.get_graph(self.g.graph_id).nodes:
-                if graph.storage.get_graph(self.g.graph_id).nodes[n].get('Name', None) == f:
-                    ret[f] = graph.storage.get_graph(self.g.graph_id).nodes[n]['NodeID']
-        return ret
+        nx_graph = graph.storage.get_graph(self.g.graph_id)
+        name_to_id = {data['Name']: data['NodeID']
+                      for _, data in nx_graph.nodes(data=True) if 'Name' in data}
+        return {f: name_to_id[f] for f in self.FAVORITE_NODES if f in name_to_id}
 
     def test_validate(self):
         """
@@ -144,11 +142,8 @@ class NetworkXPropertyGraphDisjointTests(unittest.TestCase):
         h = self.g.clone_graph(new_graph_id='dead-beef')
         assert(h.graph_id == 'dead-beef')
         extract_h = h.storage.extract_graph('dead-beef')
-        count = 0
-        for f in self.FAVORITE_NODES:
-            for n in extract_h.nodes:
-                if extract_h.nodes[n].get('Name', None) == f:
-                    count = count + 1
+        node_names = {data.get('Name', None) for _, data in extract_h.nodes(data=True)}
+        count = len(set(self.FAVORITE_NODES) & node_names)
 
         assert(count == 5)
         _, node_props = h.get_node_properties(node_id=worker1)
@@ -168,11 +163,9 @@ class NetworkXPropertyGraphDisjointTests(unittest.TestCase):
         worker1 = favs['Worker1']
         graph_string = self.g.serialize_graph()
         new_graph = self.imp.import_graph_from_string(graph_string=graph_string)
-        count = 0
-        for f in self.FAVORITE_NODES:
-            for n in new_graph.storage.get_graph(self.g.graph_id).nodes:
-                if new_graph.storage.get_graph(self.g.graph_id).nodes[n].get('Name', None) == f:
-                    count = count + 1
+        nx_graph = new_graph.storage.get_graph(self.g.graph_id)
+        node_names = {data.get('Name', None) for _, data in nx_graph.nodes(data=True)}
+        count = len(set(self.FAVORITE_NODES) & node_names)
 
         assert(count == 5)
         node_ids = new_graph.list_all_node_ids()